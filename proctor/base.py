@@ -6,12 +6,27 @@ from typing import Any, Dict, Optional, List
 from abc import ABC, abstractmethod
 from .utils import call_llm, log, LLMError
 
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:  # Only needed when compiling with mypyc
 
+    def mypyc_attr(*attrs, **kwattrs):  # type: ignore[misc]
+        """No-op stand-in for mypy_extensions.mypyc_attr."""
+        return lambda cls: cls
+
+
+# This module may be compiled with mypyc (see setup.py), and techniques
+# defined in interpreted modules must still be able to subclass these classes.
+@mypyc_attr(allow_interpreted_subclasses=True)
 class PromptTechnique(ABC):
     """
     Base class for all prompt techniques.
     """
 
+    # Subclasses that add no attributes can declare empty __slots__ so their
+    # instances carry no per-instance __dict__
+    __slots__ = ("name", "identifier", "description")
+
     def __init__(self, name: str, identifier: str, description: str = ""):
         """
         Initialize a prompt technique.
@@ -39,6 +54,24 @@ class PromptTechnique(ABC):
         """
         pass
 
+    def generate_prompts(self, input_texts: List[str], **kwargs) -> List[str]:
+        """
+        Generate prompts for several inputs that share the same options.
+
+        Techniques whose options can be resolved independently of the input
+        override this to do that work once for the whole batch.
+
+        Args:
+            input_texts (List[str]): The input texts to process
+            **kwargs: Additional arguments for prompt generation
+
+        Returns:
+            List[str]: One generated prompt per input text
+        """
+        return [
+            self.generate_prompt(input_text, **kwargs) for input_text in input_texts
+        ]
+
     def execute(
         self,
         input_text: str,
@@ -101,6 +134,7 @@ class PromptTechnique(ABC):
         return f"{self.__class__.__name__}(name='{self.name}', identifier='{self.identifier}')"
 
 
+@mypyc_attr(allow_interpreted_subclasses=True)
 class CompositeTechnique(PromptTechnique):
     """
     A technique that combines multiple techniques.
@@ -0,0 +1,257 @@
+"""
+Offline batch processing of LLM prompts.
+
+Interactive calls are billed at full price and count against request-rate
+limits. For throughput-oriented jobs (evaluation, data labeling) where
+latency does not matter, providers offer batch APIs that run requests within
+a completion window at a discount. BatchProcessor submits prompts through the
+OpenAI Batch API format via litellm (OpenAI or Azure OpenAI) and polls until
+the results are ready; with ``use_batch_api=False`` it falls back to
+concurrent interactive calls through call_llm_batch.
+
+Batch APIs are called on the provider directly, not through OpenRouter, so
+the provider's own key must be set (e.g. ``OPENAI_API_KEY``).
+"""
+
+import json
+import time
+from typing import Any, Dict, List, Optional, Union
+from .config import get_llm_config
+from .utils import (
+    LLMError,
+    _build_messages,
+    call_llm_batch,
+    log,
+    require_nonempty_str,
+)
+
+# Batch states after which polling stops
+_FINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+# Providers whose batch API takes /v1/chat/completions JSONL requests and
+# returns results in the same format
+_BATCH_PROVIDERS = ("openai", "azure")
+
+
+class BatchProcessor:
+    """
+    Run many prompts either through a provider batch API or concurrently.
+    """
+
+    def __init__(
+        self,
+        use_batch_api: bool = True,
+        provider: str = "openai",
+        poll_interval: float = 30.0,
+        completion_window: str = "24h",
+        concurrency: int = 8,
+        timeout: Optional[float] = 25 * 3600.0,
+    ):
+        """
+        Initialize the batch processor.
+
+        Args:
+            use_batch_api (bool): Submit prompts to the provider's batch API.
+                If False, prompts are sent as concurrent interactive calls.
+            provider (str): litellm provider that runs the batch, "openai" or
+                "azure"; other providers use incompatible batch formats
+            poll_interval (float): Seconds between batch status checks
+            completion_window (str): Time the provider may take for the batch
+            concurrency (int): Concurrent requests when not using the batch API
+            timeout (Optional[float]): Seconds to wait for the batch to finish
+                before giving up; the default allows the 24h completion window
+                plus an hour. None waits until the batch reaches a final state.
+
+        Raises:
+            ValueError: If provider does not offer an OpenAI-format batch API
+        """
+        if provider not in _BATCH_PROVIDERS:
+            raise ValueError(
+                f"Unsupported batch provider {provider!r}; "
+                f"expected one of {', '.join(_BATCH_PROVIDERS)}"
+            )
+
+        self.use_batch_api = use_batch_api
+        self.provider = provider
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    def run(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        config_override: Optional[Dict[str, Any]] = None,
+        return_exceptions: bool = False,
+    ) -> List[Union[str, LLMError]]:
+        """
+        Get responses for all prompts.
+
+        Args:
+            prompts (List[str]): The user prompts to send
+            system_prompt (Optional[str]): Optional system prompt shared by all
+            config_override (Optional[Dict[str, Any]]): Override default config values
+            return_exceptions (bool): If True, a failed request does not abort
+                the batch; its slot in the result holds an LLMError instead
+
+        Returns:
+            List[Union[str, LLMError]]: The responses, in the same order as
+            ``prompts``
+
+        Raises:
+            ValueError: If the model is routed to a provider other than
+                ``provider`` (e.g. "anthropic/..." for an OpenAI batch)
+            LLMError: If the batch fails or times out, or any request fails
+                and return_exceptions is False
+        """
+        if not self.use_batch_api:
+            return call_llm_batch(
+                prompts,
+                system_prompt,
+                config_override,
+                concurrency=self.concurrency,
+                return_exceptions=return_exceptions,
+            )
+
+        for prompt in prompts:
+            require_nonempty_str(prompt, "Prompt")
+        if not prompts:
+            return []
+
+        import litellm
+
+        # The OpenRouter key is not needed; litellm reads the provider's key
+        config = {**get_llm_config(), **(config_override or {})}
+        model = self._batch_model(config["model"])
+        try:
+            batch_id = self._submit(litellm, model, prompts, system_prompt, config)
+            output = self._wait(litellm, batch_id)
+        except LLMError:
+            raise
+        except Exception as e:
+            log.exception("Error running LLM batch: %s", e)
+            raise LLMError(f"Error running LLM batch: {str(e)}") from e
+
+        results = [output.get(str(i)) for i in range(len(prompts))]
+        for i, result in enumerate(results):
+            if result is None:
+                results[i] = LLMError(f"No result for batch request {i}")
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, LLMError):
+                    raise result
+        return results
+
+    def _batch_model(self, model: str) -> str:
+        """Return the model name to send to the provider's batch API."""
+        # The batch API addresses the provider directly, without a route prefix
+        route, sep, name = model.partition("/")
+        if not sep:
+            return model
+        if route != self.provider:
+            raise ValueError(
+                f"Model {model!r} is not served by batch provider {self.provider!r}"
+            )
+        return name
+
+    def _submit(
+        self,
+        litellm: Any,
+        model: str,
+        prompts: List[str],
+        system_prompt: Optional[str],
+        config: Dict[str, Any],
+    ) -> str:
+        """Upload the requests as a JSONL file and create the batch."""
+        # cache_control blocks are an Anthropic extension that OpenAI-format
+        # batch bodies do not accept
+        message_config = {**config, "cache_system_prompt": False}
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": model,
+                        "messages": _build_messages(
+                            prompt, system_prompt, message_config
+                        ),
+                        "max_tokens": config.get("max_tokens", 1000),
+                        "temperature": config.get("temperature", 0.7),
+                    },
+                }
+            )
+            for i, prompt in enumerate(prompts)
+        ]
+
+        batch_file = litellm.create_file(
+            file=("batch.jsonl", "\n".join(lines).encode()),
+            purpose="batch",
+            custom_llm_provider=self.provider,
+        )
+        batch = litellm.create_batch(
+            completion_window=self.completion_window,
+            endpoint="/v1/chat/completions",
+            input_file_id=batch_file.id,
+            custom_llm_provider=self.provider,
+        )
+        log.info("Submitted LLM batch %s with %d requests.", batch.id, len(prompts))
+        return batch.id
+
+    def _wait(self, litellm: Any, batch_id: str) -> Dict[str, Union[str, LLMError]]:
+        """Poll a batch until it finishes and return its results by custom_id."""
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        delay = self.poll_interval
+        while True:
+            batch = litellm.retrieve_batch(
+                batch_id=batch_id, custom_llm_provider=self.provider
+            )
+            if batch.status in _FINAL_STATES:
+                break
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LLMError(
+                        f"LLM batch {batch_id} did not finish within "
+                        f"{self.timeout}s (last status: {batch.status})"
+                    )
+                delay = min(self.poll_interval, remaining)
+            log.info("LLM batch %s is %s; waiting...", batch_id, batch.status)
+            time.sleep(delay)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            raise LLMError(f"LLM batch {batch_id} ended with status {batch.status}")
+
+        content = litellm.file_content(
+            file_id=batch.output_file_id, custom_llm_provider=self.provider
+        )
+        results = {}
+        for line in content.content.decode().splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code", 200) != 200:
+                error = record.get("error") or response.get("body")
+                results[record["custom_id"]] = LLMError(
+                    f"Batch request failed: {error}"
+                )
+            else:
+                body = response["body"]
+                results[record["custom_id"]] = body["choices"][0]["message"]["content"]
+        return results
+
+
+# Example usage:
+"""
+from proctor.batch import BatchProcessor
+
+processor = BatchProcessor(poll_interval=60)
+answers = processor.run(
+    ["Label the sentiment: 'Great product!'", "Label the sentiment: 'Broke in a day.'"],
+    system_prompt="Answer with one word.",
+    config_override={"model": "openai/gpt-4o-mini"},
+)
+"""
@@ -0,0 +1,33 @@
+"""
+Shared loading of sentence-transformer embedding models.
+
+Embedding models are large, so each one is loaded once per process and shared
+by every SemanticCache and SemanticKNN that uses it. It requires the optional
+sentence-transformers dependency:
+
+    uv pip install sentence-transformers
+"""
+
+import threading
+from typing import Dict
+
+try:
+    from sentence_transformers import SentenceTransformer
+
+    _DEPS_AVAILABLE = True
+except ImportError:
+    SentenceTransformer = None
+    _DEPS_AVAILABLE = False
+
+# Loaded models by name
+_MODELS: Dict[str, "SentenceTransformer"] = {}
+_MODELS_LOCK = threading.Lock()
+
+
+def load_model(model_name: str) -> "SentenceTransformer":
+    """Load a sentence-transformer model once per process and reuse it."""
+    with _MODELS_LOCK:
+        model = _MODELS.get(model_name)
+        if model is None:
+            model = _MODELS[model_name] = SentenceTransformer(model_name)
+        return model
@@ -9,18 +9,21 @@ you'll need to install additional dependencies:
 This module will be integrated with the KNN technique in a future update.
 """
 
+from collections import OrderedDict
 from typing import List, Dict, Optional, Tuple
 import numpy as np
+from ..embeddings import _DEPS_AVAILABLE as _EMBEDDINGS_AVAILABLE, load_model
 from ..utils import log
 
 # These imports would be needed for the actual implementation
 try:
-    from sentence_transformers import SentenceTransformer
     from sklearn.metrics.pairwise import cosine_similarity
 
-    _DEPS_AVAILABLE = True
+    _DEPS_AVAILABLE = _EMBEDDINGS_AVAILABLE
 except ImportError:
     _DEPS_AVAILABLE = False
+
+if not _DEPS_AVAILABLE:
     log.warning(
         "Optional dependencies for KNN are not available. "
         "Install with: uv pip install sentence-transformers scikit-learn"
@@ -30,6 +33,9 @@ except ImportError:
 class EmbeddingCache:
     """
     Cache for storing and retrieving text embeddings.
+
+    Embeddings are stored as float32 rows of one preallocated matrix, and
+    ``cache`` maps each text to its row in least-recently-used order.
     """
 
     def __init__(self, max_size: int = 1000):
@@ -39,8 +45,17 @@ class EmbeddingCache:
         Args:
             max_size (int): Maximum number of embeddings to store
         """
-        self.cache: Dict[str, np.ndarray] = {}
+        self.cache: "OrderedDict[str, int]" = OrderedDict()
         self.max_size = max_size
+        # Allocated on the first add, once the embedding dimension is known
+        self._matrix: Optional[np.ndarray] = None
+
+    def _row(self, text: str) -> Optional[int]:
+        """Return the storage row of a text, marking it as recently used."""
+        row = self.cache.get(text)
+        if row is not None:
+            self.cache.move_to_end(text)
+        return row
 
     def get(self, text: str) -> Optional[np.ndarray]:
         """
@@ -50,9 +65,36 @@ class EmbeddingCache:
             text (str): Text to retrieve embedding for
 
         Returns:
-            Optional[np.ndarray]: Embedding if available, None otherwise
+            Optional[np.ndarray]: A copy of the embedding if available, None
+            otherwise
         """
-        return self.cache.get(text)
+        row = self._row(text)
+        if row is None:
+            return None
+        return self._matrix[row].copy()
+
+    def get_many(self, texts: List[str]) -> Tuple[Optional[np.ndarray], List[int]]:
+        """
+        Get embeddings for several texts, gathering the cached rows at once.
+
+        Args:
+            texts (List[str]): Texts to retrieve embeddings for
+
+        Returns:
+            Tuple[Optional[np.ndarray], List[int]]: A new (len(texts), dim)
+            matrix holding the cached embeddings, whose rows for uncached texts
+            are left unset (None if nothing was ever cached), and the indices
+            of the uncached texts
+        """
+        rows = [self._row(text) for text in texts]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        if self._matrix is None:
+            return None, missing
+
+        found = [i for i, row in enumerate(rows) if row is not None]
+        embeddings = np.empty((len(texts), self._matrix.shape[1]), dtype=np.float32)
+        embeddings[found] = self._matrix[[rows[i] for i in found]]
+        return embeddings, missing
 
     def add(self, text: str, embedding: np.ndarray) -> None:
         """
@@ -62,12 +104,23 @@ class EmbeddingCache:
             text (str): Text
             embedding (np.ndarray): Embedding to cache
         """
-        # Simple LRU implementation - remove oldest item if cache is full
-        if len(self.cache) >= self.max_size and text not in self.cache:
-            # Remove first item (oldest)
-            self.cache.pop(next(iter(self.cache)))
+        if self.max_size <= 0:
+            return
+        if self._matrix is None:
+            self._matrix = np.empty(
+                (self.max_size, np.shape(embedding)[-1]), dtype=np.float32
+            )
 
-        self.cache[text] = embedding
+        row = self.cache.get(text)
+        if row is None:
+            if len(self.cache) < self.max_size:
+                row = len(self.cache)
+            else:
+                # Reuse the row of the least recently used item
+                _, row = self.cache.popitem(last=False)
+        self.cache[text] = row
+        self.cache.move_to_end(text)
+        self._matrix[row] = embedding
 
 
 class SemanticKNN:
@@ -92,7 +145,7 @@ class SemanticKNN:
                 "Install with: uv pip install sentence-transformers scikit-learn"
             )
 
-        self.model = SentenceTransformer(model_name)
+        self.model = load_model(model_name)
         self.cache = EmbeddingCache(max_size=cache_size)
 
     def _get_embedding(self, text: str) -> np.ndarray:
@@ -135,14 +188,27 @@ class SemanticKNN:
         if not candidates:
             return []
 
-        # Get query embedding
         query_embedding = self._get_embedding(query)
 
-        # Get embeddings for all candidates
+        # Gather cached candidate embeddings, encoding the misses in one batch
         candidate_texts = [c[text_key] for c in candidates]
-        candidate_embeddings = np.vstack(
-            [self._get_embedding(text) for text in candidate_texts]
-        )
+        candidate_embeddings, missing = self.cache.get_many(candidate_texts)
+        if missing:
+            missing_texts = list(dict.fromkeys(candidate_texts[i] for i in missing))
+            encoded = np.asarray(
+                self.model.encode(missing_texts, convert_to_numpy=True),
+                dtype=np.float32,
+            )
+            if candidate_embeddings is None:
+                candidate_embeddings = np.empty(
+                    (len(candidate_texts), encoded.shape[1]), dtype=np.float32
+                )
+            position = {text: i for i, text in enumerate(missing_texts)}
+            candidate_embeddings[missing] = encoded[
+                [position[candidate_texts[i]] for i in missing]
+            ]
+            for text, embedding in zip(missing_texts, encoded):
+                self.cache.add(text, embedding)
 
         # Calculate similarities
         similarities = cosine_similarity(
@@ -0,0 +1,151 @@
+"""
+Client-side rate limiting for LLM calls.
+
+Backoff only reacts after a provider has rejected a request. The limiters here
+throttle requests and tokens before they are sent, so concurrent callers stay
+under a provider's requests-per-minute and tokens-per-minute ceilings.
+
+Limits are read from the LLM config:
+
+    config_override={"max_requests_per_minute": 500, "max_tokens_per_minute": 90000}
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """
+    Token bucket shared by threads and coroutines.
+
+    Each acquire reserves its tokens immediately, letting the level go
+    negative, and then waits until the bucket has refilled to cover the
+    reservation. Callers are therefore served in arrival order.
+    """
+
+    def __init__(self, rate_per_sec: float, capacity: float):
+        """
+        Initialize the bucket, starting full.
+
+        Args:
+            rate_per_sec (float): Tokens added per second
+            capacity (float): Maximum number of tokens the bucket holds
+        """
+        if rate_per_sec <= 0 or capacity <= 0:
+            raise ValueError("rate_per_sec and capacity must be positive")
+
+        self.rate_per_sec = rate_per_sec
+        self.capacity = capacity
+        self._level = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens from the bucket and return how long to wait for them."""
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(
+                self.capacity, self._level + (now - self._updated) * self.rate_per_sec
+            )
+            self._updated = now
+            self._level -= tokens
+            if self._level >= 0:
+                return 0.0
+            return -self._level / self.rate_per_sec
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Block the calling thread until ``tokens`` are available."""
+        delay = self._reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: float = 1) -> None:
+        """Wait without blocking the event loop until ``tokens`` are available."""
+        delay = self._reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    """
+    Request and token limits for one model endpoint.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_minute (Optional[float]): Request ceiling, if any
+            tokens_per_minute (Optional[float]): Token ceiling, if any
+        """
+        self.requests = (
+            TokenBucket(requests_per_minute / 60, requests_per_minute)
+            if requests_per_minute
+            else None
+        )
+        self.tokens = (
+            TokenBucket(tokens_per_minute / 60, tokens_per_minute)
+            if tokens_per_minute
+            else None
+        )
+
+    def acquire(self, tokens: int = 0) -> None:
+        """
+        Block until one request using ``tokens`` tokens may be sent.
+
+        Args:
+            tokens (int): Estimated tokens used by the request
+        """
+        if self.requests is not None:
+            self.requests.acquire()
+        if self.tokens is not None and tokens:
+            self.tokens.acquire(min(tokens, self.tokens.capacity))
+
+    async def acquire_async(self, tokens: int = 0) -> None:
+        """
+        Asynchronously wait until one request using ``tokens`` tokens may be sent.
+
+        Args:
+            tokens (int): Estimated tokens used by the request
+        """
+        if self.requests is not None:
+            await self.requests.acquire_async()
+        if self.tokens is not None and tokens:
+            await self.tokens.acquire_async(min(tokens, self.tokens.capacity))
+
+
+# One limiter per endpoint and limit setting, shared by all calls in the process
+_LIMITERS: Dict[Tuple[Any, ...], RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(config: Dict[str, Any]) -> Optional[RateLimiter]:
+    """
+    Return the shared rate limiter for a configuration.
+
+    Args:
+        config (Dict[str, Any]): Resolved LLM configuration
+
+    Returns:
+        Optional[RateLimiter]: The limiter for the config's model and API base,
+        or None if neither ``max_requests_per_minute`` nor
+        ``max_tokens_per_minute`` is set
+    """
+    rpm = config.get("max_requests_per_minute")
+    tpm = config.get("max_tokens_per_minute")
+    if not rpm and not tpm:
+        return None
+
+    key = (config.get("model"), config.get("api_base"), rpm, tpm)
+    limiter = _LIMITERS.get(key)
+    if limiter is None:
+        with _LIMITERS_LOCK:
+            limiter = _LIMITERS.setdefault(key, RateLimiter(rpm, tpm))
+    return limiter
@@ -0,0 +1,267 @@
+"""
+Semantic response cache for LLM calls.
+
+Exact-match caching misses rephrased prompts ("capital of France?" vs
+"France's capital?"). SemanticCache embeds each prompt and serves a stored
+response when a new prompt is similar enough to a previous one. It requires
+the optional sentence-transformers dependency:
+
+    uv pip install sentence-transformers
+
+Install it for call_llm / call_llm_async with proctor.utils.set_semantic_cache().
+"""
+
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .embeddings import _DEPS_AVAILABLE, load_model
+from .utils import log
+
+
+class SemanticCache:
+    """
+    Cache of LLM responses looked up by prompt similarity.
+
+    Entries are scoped by model and system prompt, which must match exactly;
+    within a scope the prompt with the highest cosine similarity is returned
+    if it reaches the threshold. Embeddings live in one preallocated float32
+    matrix used as a ring buffer, so once ``max_entries`` is reached each new
+    entry replaces the oldest one.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        threshold: float = 0.92,
+        path: Optional[str] = None,
+        max_entries: int = 10000,
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            model_name (str): Name of the sentence-transformer model to use
+            threshold (float): Minimum cosine similarity for a cache hit
+            path (Optional[str]): SQLite file used to persist entries across
+                processes. Entries are kept in memory only when omitted.
+            max_entries (int): Maximum number of entries to keep; the oldest
+                entries are evicted (also from SQLite) beyond it
+
+        Raises:
+            ImportError: If required dependencies are not installed
+            ValueError: If max_entries is not positive
+        """
+        if not _DEPS_AVAILABLE:
+            raise ImportError(
+                "Required dependencies not available. "
+                "Install with: uv pip install sentence-transformers"
+            )
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._model = None  # Loaded on first lookup
+        self._lock = threading.Lock()
+        # Row i of the matrix holds the normalized embedding of entry i; the
+        # matrix grows by doubling up to max_entries rows.
+        self._matrix: Optional[np.ndarray] = None
+        self._scopes = np.empty(0, dtype=np.int64)
+        self._responses: List[Optional[str]] = []
+        self._rowids: List[Optional[int]] = []  # SQLite rowid of each entry
+        self._evicted: List[Optional[int]] = []  # Rowids still to delete
+        self._scope_ids: Dict[str, int] = {}
+        self._size = 0
+        self._next = 0  # Row the next entry is written to
+
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(scope TEXT, prompt TEXT, response TEXT, embedding BLOB)"
+            )
+            rows = self._db.execute(
+                "SELECT rowid, scope, response, embedding FROM entries ORDER BY rowid"
+            ).fetchall()
+            with self._lock:
+                for rowid, scope, response, blob in rows:
+                    embedding = np.frombuffer(blob, dtype=np.float32)
+                    self._add(scope, embedding, response, rowid)
+                self._delete_evicted()
+
+    @staticmethod
+    def _scope(model: Optional[str], system_prompt: Optional[str]) -> str:
+        """Key for the group of entries a prompt is compared against."""
+        return f"{model or ''}\0{system_prompt or ''}"
+
+    def _embed(self, prompt: str) -> np.ndarray:
+        """Return the unit-length float32 embedding of a prompt."""
+        if self._model is None:
+            self._model = load_model(self.model_name)
+        embedding = np.asarray(
+            self._model.encode(prompt, convert_to_numpy=True), dtype=np.float32
+        )
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
+
+    def _add(
+        self, scope: str, embedding: np.ndarray, response: str, rowid: Optional[int]
+    ) -> None:
+        """Write an entry to the in-memory index, evicting the oldest if full.
+
+        Must be called with the lock held.
+        """
+        if self._matrix is None:
+            self._matrix = np.empty((0, embedding.shape[-1]), dtype=np.float32)
+        if self._next == len(self._matrix) and len(self._matrix) < self.max_entries:
+            capacity = min(max(2 * len(self._matrix), 16), self.max_entries)
+            matrix = np.empty((capacity, self._matrix.shape[1]), dtype=np.float32)
+            matrix[: self._size] = self._matrix[: self._size]
+            scopes = np.empty(capacity, dtype=np.int64)
+            scopes[: self._size] = self._scopes[: self._size]
+            self._matrix, self._scopes = matrix, scopes
+
+        row = self._next
+        scope_id = self._scope_ids.setdefault(scope, len(self._scope_ids))
+        self._matrix[row] = embedding
+        self._scopes[row] = scope_id
+        if row == len(self._responses):
+            self._responses.append(response)
+            self._rowids.append(rowid)
+        else:
+            self._evicted.append(self._rowids[row])
+            self._responses[row] = response
+            self._rowids[row] = rowid
+        self._size = max(self._size, row + 1)
+        self._next = (row + 1) % self.max_entries
+
+    def _delete_evicted(self) -> None:
+        """Drop evicted entries from SQLite. Must be called with the lock held."""
+        evicted = [rowid for rowid in self._evicted if rowid is not None]
+        self._evicted = []
+        if evicted and self._db is not None:
+            with self._db:
+                self._db.executemany(
+                    "DELETE FROM entries WHERE rowid = ?", [(r,) for r in evicted]
+                )
+
+    def lookup(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> Tuple[Optional[str], np.ndarray]:
+        """
+        Look up the response to the most similar cached prompt.
+
+        Unlike get(), this also returns the prompt's embedding, so that a miss
+        can be stored with put() without embedding the prompt again.
+
+        Args:
+            prompt (str): The user prompt
+            system_prompt (Optional[str]): The system prompt, matched exactly
+            model (Optional[str]): The model name, matched exactly
+
+        Returns:
+            Tuple[Optional[str], np.ndarray]: The cached response (None on a
+            miss) and the normalized embedding of the prompt
+        """
+        embedding = self._embed(prompt)
+        with self._lock:
+            scope_id = self._scope_ids.get(self._scope(model, system_prompt))
+            if scope_id is None or self._size == 0:
+                return None, embedding
+            similarities = self._matrix[: self._size] @ embedding
+            similarities[self._scopes[: self._size] != scope_id] = -np.inf
+            best = int(similarities.argmax())
+            if similarities[best] < self.threshold:
+                return None, embedding
+            response = self._responses[best]
+
+        log.info("Semantic cache hit (similarity %.3f).", similarities[best])
+        return response, embedding
+
+    def get(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Look up the response to the most similar cached prompt.
+
+        Args:
+            prompt (str): The user prompt
+            system_prompt (Optional[str]): The system prompt, matched exactly
+            model (Optional[str]): The model name, matched exactly
+
+        Returns:
+            Optional[str]: The cached response, or None on a miss
+        """
+        return self.lookup(prompt, system_prompt, model)[0]
+
+    def put(
+        self,
+        prompt: str,
+        response: str,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+        embedding: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Store a response for a prompt.
+
+        Args:
+            prompt (str): The user prompt
+            response (str): The LLM response
+            system_prompt (Optional[str]): The system prompt
+            model (Optional[str]): The model name
+            embedding (Optional[np.ndarray]): The prompt's embedding as
+                returned by lookup(); computed when omitted
+        """
+        scope = self._scope(model, system_prompt)
+        if embedding is None:
+            embedding = self._embed(prompt)
+
+        with self._lock:
+            rowid = None
+            if self._db is not None:
+                with self._db:
+                    rowid = self._db.execute(
+                        "INSERT INTO entries VALUES (?, ?, ?, ?)",
+                        (scope, prompt, response, embedding.tobytes()),
+                    ).lastrowid
+            self._add(scope, embedding, response, rowid)
+            self._delete_evicted()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        """Remove all entries, including persisted ones."""
+        with self._lock:
+            self._matrix = None
+            self._scopes = np.empty(0, dtype=np.int64)
+            self._responses = []
+            self._rowids = []
+            self._evicted = []
+            self._scope_ids = {}
+            self._size = self._next = 0
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM entries")
+
+
+# Example usage:
+"""
+from proctor.semantic_cache import SemanticCache
+from proctor.utils import call_llm, set_semantic_cache
+
+set_semantic_cache(SemanticCache(path="semcache.sqlite"))
+
+call_llm("What is the capital of France?")
+call_llm("What's France's capital city?")  # Served from the cache
+"""
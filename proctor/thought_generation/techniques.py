@@ -1,6 +1,62 @@
+import functools
+import operator
 from typing import List, Dict, Optional
 from ..base import PromptTechnique
-from ..utils import dedent_prompt
+from ..utils import dedent_prompt, dedent_method_prompt, require_nonempty_str
+
+# Closing scaffold shared by the CoT templates; the problem text always comes
+# last so everything before it forms a stable, cacheable prompt prefix.
+_QUESTION_TAIL = "\n\nProblem/Question: {input_text}\n\nReasoning:"
+_PROBLEM_TAIL = "\n\nProblem: {input_text}"
+
+# Default worked examples for FewShotCoT, formatted once at import time.
+_DEFAULT_EXAMPLES = (
+    {
+        "problem": "If John has 5 apples and gives 2 to Mary, how many does he have left?",
+        "reasoning": "John starts with 5 apples. He gives 2 apples to Mary. Subtracting the apples given away, 5 - 2 = 3 apples remain.",
+        "answer": "3 apples",
+    },
+    {
+        "problem": "If a train travels 120 km in 2 hours, what is its speed?",
+        "reasoning": "To find speed, use the formula: speed = distance ÷ time. The train travels 120 km in 2 hours. Therefore, speed = 120 km ÷ 2 hours = 60 km/hour.",
+        "answer": "60 km/hour",
+    },
+)
+
+# Layout of one worked example, filled from _EXAMPLE_FIELDS
+_EXAMPLE_FORMAT = "Problem: %s\n\nReasoning: %s\n\nAnswer: %s"
+_EXAMPLE_FIELDS = operator.itemgetter("problem", "reasoning", "answer")
+
+_DEFAULT_EXAMPLES_TEXT = "\n\n".join(
+    _EXAMPLE_FORMAT % _EXAMPLE_FIELDS(example) for example in _DEFAULT_EXAMPLES
+)
+
+
+_DETAIL_GUIDANCE = {
+    "brief": "Focus on key insights with minimal explanation.",
+    "standard": "Provide balanced reasoning with moderate detail.",
+    "detailed": "Explore nuances and provide comprehensive explanation.",
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _chain_of_thought_instructions(
+    approach: str, detail_level: str, include_alternatives: bool
+) -> str:
+    """Build the default ChainOfThought instructions for one option combination."""
+    approach_text = f" using a {approach} approach" if approach else ""
+
+    detail_guidance = _DETAIL_GUIDANCE.get(
+        detail_level, "Provide balanced reasoning with moderate detail."
+    )
+
+    alternatives_text = (
+        "\n\nConsider at least one alternative approach or perspective before reaching your final conclusion."
+        if include_alternatives
+        else ""
+    )
+
+    return f"Let's work through this{approach_text} step-by-step. {detail_guidance}{alternatives_text}"
 
 
 class ChainOfThought(PromptTechnique):
@@ -8,6 +64,17 @@ class ChainOfThought(PromptTechnique):
     Chain-of-Thought (CoT) encourages step-by-step reasoning for problem-solving.
     """
 
+    # Dedented once when the class is created and filled with str.format_map per call.
+    # The problem comes last so the static scaffold forms a reusable prompt prefix.
+    _template = (
+        dedent_prompt("""
+        {custom_instructions}
+
+        {steps_text}Conclude with "Therefore, the final answer is:" followed by the answer.
+        """)
+        + _QUESTION_TAIL
+    )
+
     def __init__(self, num_steps: int = 3):
         """
         Initialize Chain-of-Thought technique.
@@ -22,17 +89,40 @@ class ChainOfThought(PromptTechnique):
         )
         self.num_steps = max(1, num_steps)  # Ensure at least one step
 
-    def generate_prompt(self, input_text: str, **kwargs) -> str:
+        # The step scaffold depends only on num_steps, so build it once
+        self._steps_text = "".join(
+            f"{step_num}. {self._step_description(step_num)}\n\n"
+            for step_num in range(1, self.num_steps + 1)
+        )
+
+    def _step_description(self, step_num: int) -> str:
+        """Return the placeholder text for a given (1-based) reasoning step."""
+        if step_num == 1:
+            return "[Identify the key components of the problem]"
+        if step_num == self.num_steps:
+            return "[Derive the final result based on previous steps]"
+        return "[Apply logical reasoning to continue from previous steps]"
+
+    def generate_prompt(
+        self,
+        input_text: str,
+        *,
+        custom_instructions: Optional[str] = None,
+        approach: str = "",
+        detail_level: str = "standard",
+        include_alternatives: bool = False,
+        **kwargs,
+    ) -> str:
         """
         Generate a Chain-of-Thought prompt with step-by-step reasoning guidance.
 
         Args:
             input_text (str): The problem or question to be solved.
-            **kwargs: Additional arguments:
-                - custom_instructions (str): Custom instruction text
-                - approach (str): Optional reasoning approach (e.g., "analytical", "mathematical")
-                - detail_level (str): Optional level of detail ("brief", "standard", "detailed")
-                - include_alternatives (bool): Whether to explore alternative approaches
+            custom_instructions (Optional[str]): Custom instruction text
+            approach (str): Optional reasoning approach (e.g., "analytical", "mathematical")
+            detail_level (str): Optional level of detail ("brief", "standard", "detailed")
+            include_alternatives (bool): Whether to explore alternative approaches
+            **kwargs: Unused; accepted so techniques can share arguments.
 
         Returns:
             str: Formatted Chain-of-Thought prompt.
@@ -40,56 +130,27 @@ class ChainOfThought(PromptTechnique):
         Raises:
             ValueError: If input_text is empty or invalid.
         """
-        if not input_text or not isinstance(input_text, str):
-            raise ValueError("input_text must be a non-empty string")
-
-        approach = kwargs.get("approach", "")
-        detail_level = kwargs.get("detail_level", "standard")
-        include_alternatives = kwargs.get("include_alternatives", False)
-
-        # Customize guidance based on parameters
-        approach_text = f" using a {approach} approach" if approach else ""
-
-        detail_guidance = {
-            "brief": "Focus on key insights with minimal explanation.",
-            "standard": "Provide balanced reasoning with moderate detail.",
-            "detailed": "Explore nuances and provide comprehensive explanation.",
-        }.get(detail_level, "Provide balanced reasoning with moderate detail.")
-
-        alternatives_text = (
-            "\n\nConsider at least one alternative approach or perspective before reaching your final conclusion."
-            if include_alternatives
-            else ""
-        )
-
-        custom_instructions = kwargs.get(
-            "custom_instructions",
-            f"Let's work through this{approach_text} step-by-step. {detail_guidance}{alternatives_text}",
+        require_nonempty_str(input_text)
+
+        if custom_instructions is None:
+            custom_instructions = _chain_of_thought_instructions(
+                approach, detail_level, bool(include_alternatives)
+            )
+
+        return self._template.format_map(
+            {
+                "input_text": input_text,
+                "custom_instructions": custom_instructions,
+                "steps_text": self._steps_text,
+            }
         )
 
-        # Create a structured prompt with clearer guidance for each step
-        steps_text = ""
-        for i in range(self.num_steps):
-            step_num = i + 1
-            if step_num == 1:
-                steps_text += (
-                    f"{step_num}. [Identify the key components of the problem]\n\n"
-                )
-            elif step_num == self.num_steps:
-                steps_text += (
-                    f"{step_num}. [Derive the final result based on previous steps]\n\n"
-                )
-            else:
-                steps_text += f"{step_num}. [Apply logical reasoning to continue from previous steps]\n\n"
 
-        prompt = dedent_prompt(f"""
-        Problem/Question: {input_text}
-
-        {custom_instructions}
-        
-        {steps_text}Therefore, the final answer is:
-        """)
-        return prompt
+_ZERO_SHOT_COT_COMPLEXITY_GUIDANCE = {
+    "simple": "Break this down into basic steps, focusing on the core concepts.",
+    "intermediate": "Analyze this methodically, considering important factors and relationships.",
+    "advanced": "Examine this comprehensively, addressing nuances and exploring deeper implications.",
+}
 
 
 class ZeroShotCoT(PromptTechnique):
@@ -97,6 +158,21 @@ class ZeroShotCoT(PromptTechnique):
     Zero-Shot Chain-of-Thought adds a reasoning prompt without examples.
     """
 
+    _template = (
+        dedent_prompt("""
+        {custom_instructions}
+
+        1. [First, I'll identify what the problem is asking and key information provided]
+
+        2. [Next, I'll determine an approach to solve this systematically]
+
+        3. [I'll work through each logical step of my solution]
+
+        4. [Finally, I'll verify my solution and formulate my answer]
+        """)
+        + _QUESTION_TAIL
+    )
+
     def __init__(self):
         """Initialize Zero-Shot Chain-of-Thought technique."""
         super().__init__(
@@ -105,17 +181,26 @@ class ZeroShotCoT(PromptTechnique):
             description="Encourages step-by-step reasoning with a simple prompt.",
         )
 
-    def generate_prompt(self, input_text: str, **kwargs) -> str:
+    def generate_prompt(
+        self,
+        input_text: str,
+        *,
+        custom_instructions: Optional[str] = None,
+        domain: str = "",
+        reasoning_style: str = "",
+        complexity: str = "",
+        **kwargs,
+    ) -> str:
         """
         Generate a Zero-Shot Chain-of-Thought prompt.
 
         Args:
             input_text (str): The problem or question to be solved.
-            **kwargs: Additional arguments:
-                - custom_instructions (str): Custom instruction text
-                - domain (str): Optional domain for contextualizing the reasoning
-                - reasoning_style (str): Optional reasoning style ("analytical", "creative", etc.)
-                - complexity (str): Optional complexity level ("simple", "intermediate", "advanced")
+            custom_instructions (Optional[str]): Custom instruction text
+            domain (str): Optional domain for contextualizing the reasoning
+            reasoning_style (str): Optional reasoning style ("analytical", "creative", etc.)
+            complexity (str): Optional complexity level ("simple", "intermediate", "advanced")
+            **kwargs: Unused; accepted so techniques can share arguments.
 
         Returns:
             str: Formatted Zero-Shot CoT prompt.
@@ -123,40 +208,24 @@ class ZeroShotCoT(PromptTechnique):
         Raises:
             ValueError: If input_text is empty or invalid.
         """
-        if not input_text or not isinstance(input_text, str):
-            raise ValueError("input_text must be a non-empty string")
+        require_nonempty_str(input_text)
 
-        domain = kwargs.get("domain", "")
-        reasoning_style = kwargs.get("reasoning_style", "")
-        complexity = kwargs.get("complexity", "")
+        if custom_instructions is not None:
+            return self._template.format_map(
+                {"input_text": input_text, "custom_instructions": custom_instructions}
+            )
 
         domain_context = f" in the domain of {domain}" if domain else ""
         style_context = f" using {reasoning_style} reasoning" if reasoning_style else ""
-        complexity_guidance = {
-            "simple": "Break this down into basic steps, focusing on the core concepts.",
-            "intermediate": "Analyze this methodically, considering important factors and relationships.",
-            "advanced": "Examine this comprehensively, addressing nuances and exploring deeper implications.",
-        }.get(complexity, "")
+        complexity_guidance = _ZERO_SHOT_COT_COMPLEXITY_GUIDANCE.get(complexity, "")
 
         complexity_text = f" {complexity_guidance}" if complexity else ""
 
-        custom_instruction_base = f"Let's think step by step{domain_context}{style_context} to solve this problem:{complexity_text}"
-        custom_instructions = kwargs.get("custom_instructions", custom_instruction_base)
-
-        prompt = dedent_prompt(f"""
-        Problem/Question: {input_text}
-
-        {custom_instructions}
+        custom_instructions = f"Let's think step by step{domain_context}{style_context} to solve this problem:{complexity_text}"
 
-        1. [First, I'll identify what the problem is asking and key information provided]
-        
-        2. [Next, I'll determine an approach to solve this systematically]
-        
-        3. [I'll work through each logical step of my solution]
-        
-        4. [Finally, I'll verify my solution and formulate my answer]
-        """)
-        return prompt
+        return self._template.format_map(
+            {"input_text": input_text, "custom_instructions": custom_instructions}
+        )
 
 
 class FewShotCoT(PromptTechnique):
@@ -164,6 +233,26 @@ class FewShotCoT(PromptTechnique):
     Few-Shot Chain-of-Thought provides examples of step-by-step reasoning.
     """
 
+    # The examples block is substituted whole, so its lines never affect dedenting.
+    _template = (
+        dedent_prompt("""
+        Below are examples of problems solved using effective step-by-step reasoning. Study these patterns carefully:
+
+        {examples_text}
+
+        {custom_instructions}
+        {focus_text}
+
+        I'll solve the problem below by following a similar reasoning process:
+        1. First, I'll understand what the problem is asking
+        2. Then, I'll identify the key information and constraints
+        3. Next, I'll apply a systematic approach similar to the examples
+        4. Finally, I'll derive the answer through careful reasoning
+        """)
+        + _PROBLEM_TAIL
+        + "\n\nReasoning:"
+    )
+
     def __init__(self):
         """Initialize Few-Shot Chain-of-Thought technique."""
         super().__init__(
@@ -171,6 +260,8 @@ class FewShotCoT(PromptTechnique):
             identifier="2.2.3.2",
             description="Provides examples of step-by-step reasoning to guide problem-solving.",
         )
+        # (examples, snapshot, examples_text) for the last custom examples list
+        self._examples_cache = None
 
     def _validate_examples(self, examples: List[Dict[str, str]]) -> None:
         """
@@ -193,8 +284,47 @@ class FewShotCoT(PromptTechnique):
             ):
                 raise ValueError("Example fields must be non-empty strings")
 
+    def _format_examples(self, examples: List[Dict[str, str]]) -> str:
+        """
+        Validate and format custom examples, reusing the last result.
+
+        Batch pipelines typically pass the same examples list on every call.
+        When that list is passed again with unchanged contents, validation and
+        formatting are skipped; the snapshot comparison catches in-place edits.
+
+        Args:
+            examples (List[Dict[str, str]]): List of example dictionaries.
+
+        Returns:
+            str: The examples formatted as a single text block.
+
+        Raises:
+            ValueError: If examples are invalid or missing required keys.
+        """
+        cached = self._examples_cache
+        if cached is not None and cached[0] is examples and examples == cached[1]:
+            return cached[2]
+
+        self._validate_examples(examples)
+        examples_text = "\n\n".join(
+            [_EXAMPLE_FORMAT % _EXAMPLE_FIELDS(example) for example in examples]
+        )
+        self._examples_cache = (
+            examples,
+            [dict(example) for example in examples],
+            examples_text,
+        )
+        return examples_text
+
     def generate_prompt(
-        self, input_text: str, examples: Optional[List[Dict[str, str]]] = None, **kwargs
+        self,
+        input_text: str,
+        examples: Optional[List[Dict[str, str]]] = None,
+        *,
+        custom_instructions: Optional[str] = None,
+        domain: str = "",
+        focus_areas: Optional[List[str]] = None,
+        **kwargs,
     ) -> str:
         """
         Generate a Few-Shot Chain-of-Thought prompt with examples of reasoning.
@@ -202,7 +332,10 @@ class FewShotCoT(PromptTechnique):
         Args:
             input_text (str): The problem or question to be solved.
             examples (Optional[List[Dict[str, str]]]): Examples with 'problem', 'reasoning', and 'answer' keys.
-            **kwargs: Additional arguments (e.g., custom instructions).
+            custom_instructions (Optional[str]): Custom instruction text
+            domain (str): Optional domain of the problem
+            focus_areas (Optional[List[str]]): Aspects to pay special attention to
+            **kwargs: Unused; accepted so techniques can share arguments.
 
         Returns:
             str: Formatted Few-Shot CoT prompt.
@@ -210,68 +343,31 @@ class FewShotCoT(PromptTechnique):
         Raises:
             ValueError: If input_text is empty or examples are invalid.
         """
-        if not input_text or not isinstance(input_text, str):
-            raise ValueError("input_text must be a non-empty string")
+        require_nonempty_str(input_text)
 
-        # Use default examples if none provided
+        # The default examples are known to be valid and are pre-formatted
         if examples is None:
-            examples = [
-                {
-                    "problem": "If John has 5 apples and gives 2 to Mary, how many does he have left?",
-                    "reasoning": "John starts with 5 apples. He gives 2 apples to Mary. Subtracting the apples given away, 5 - 2 = 3 apples remain.",
-                    "answer": "3 apples",
-                },
-                {
-                    "problem": "If a train travels 120 km in 2 hours, what is its speed?",
-                    "reasoning": "To find speed, use the formula: speed = distance ÷ time. The train travels 120 km in 2 hours. Therefore, speed = 120 km ÷ 2 hours = 60 km/hour.",
-                    "answer": "60 km/hour",
-                },
-            ]
-
-        # Validate examples
-        self._validate_examples(examples)
-
-        # Format examples into prompt
-        examples_text = "\n\n".join(
-            [
-                f"Problem: {example['problem']}\n\nReasoning: {example['reasoning']}\n\nAnswer: {example['answer']}"
-                for example in examples
-            ]
-        )
-
-        domain = kwargs.get("domain", "")
-        focus_areas = kwargs.get("focus_areas", [])
+            examples_text = _DEFAULT_EXAMPLES_TEXT
+        else:
+            examples_text = self._format_examples(examples)
 
-        domain_text = f" in {domain}" if domain else ""
         focus_text = ""
         if focus_areas:
             focus_text = "\n- Pay special attention to: " + ", ".join(focus_areas)
 
-        custom_instructions = kwargs.get(
-            "custom_instructions",
-            f"Use the same step-by-step reasoning approach as shown in the examples to solve the following problem{domain_text}:",
+        if custom_instructions is None:
+            domain_text = f" in {domain}" if domain else ""
+            custom_instructions = f"Use the same step-by-step reasoning approach as shown in the examples to solve the following problem{domain_text}:"
+
+        return self._template.format_map(
+            {
+                "examples_text": examples_text,
+                "custom_instructions": custom_instructions,
+                "focus_text": focus_text,
+                "input_text": input_text,
+            }
         )
 
-        prompt = dedent_prompt(f"""
-        Below are examples of problems solved using effective step-by-step reasoning. Study these patterns carefully:
-
-        {examples_text}
-
-        {custom_instructions}
-        {focus_text}
-
-        Problem: {input_text}
-
-        I'll solve this by following a similar reasoning process:
-        1. First, I'll understand what the problem is asking
-        2. Then, I'll identify the key information and constraints
-        3. Next, I'll apply a systematic approach similar to the examples
-        4. Finally, I'll derive the answer through careful reasoning
-
-        Reasoning:
-        """)
-        return prompt
-
 
 class AnalogicalPrompting(PromptTechnique):
     """
@@ -315,7 +411,7 @@ class AnalogicalPrompting(PromptTechnique):
 
         analogies_text = "\n".join([f"- {analogy}" for analogy in analogy_examples])
 
-        prompt = dedent_prompt(f"""
+        prompt = dedent_method_prompt(f"""
         Problem: {input_text}
         
         To solve this problem, I'll use analogical reasoning by drawing parallels to familiar situations:
@@ -334,6 +430,13 @@ class AnalogicalPrompting(PromptTechnique):
         return prompt
 
 
+_ABSTRACTION_GUIDANCE = {
+    "principles": "fundamental principles and underlying laws",
+    "concepts": "key concepts and theoretical frameworks",
+    "patterns": "common patterns and recurring themes",
+}
+
+
 class StepBackPrompting(PromptTechnique):
     """
     Step-Back Prompting encourages taking a step back to consider higher-level principles.
@@ -368,13 +471,11 @@ class StepBackPrompting(PromptTechnique):
 
         domain_text = f" in {domain_knowledge}" if domain_knowledge else ""
 
-        abstraction_guidance = {
-            "principles": "fundamental principles and underlying laws",
-            "concepts": "key concepts and theoretical frameworks",
-            "patterns": "common patterns and recurring themes",
-        }.get(abstraction_level, "fundamental principles")
+        abstraction_guidance = _ABSTRACTION_GUIDANCE.get(
+            abstraction_level, "fundamental principles"
+        )
 
-        prompt = dedent_prompt(f"""
+        prompt = dedent_method_prompt(f"""
         Problem: {input_text}
         
         Before diving into the specifics, let me step back and consider the bigger picture.
@@ -445,7 +546,7 @@ class ThreadOfThought(PromptTechnique):
             ]
         )
 
-        prompt = dedent_prompt(f"""
+        prompt = dedent_method_prompt(f"""
         Problem: {input_text}
         
         I'll approach this complex problem by maintaining multiple coherent reasoning threads:
@@ -512,7 +613,7 @@ class TabCoT(PromptTechnique):
 
         table_template = f"{headers_text}\n{separator}\n" + "\n".join(table_rows)
 
-        prompt = dedent_prompt(f"""
+        prompt = dedent_method_prompt(f"""
         Problem: {input_text}
         
         I'll organize my reasoning systematically using a tabular approach:
@@ -532,6 +633,13 @@ class TabCoT(PromptTechnique):
         return prompt
 
 
+_ACTIVE_PROMPT_COMPLEXITY_GUIDANCE = {
+    "low": "Focus on clear, direct reasoning steps",
+    "medium": "Balance thoroughness with efficiency",
+    "high": "Use comprehensive analysis with multiple verification steps",
+}
+
+
 class ActivePrompt(PromptTechnique):
     """
     Active-Prompt adapts the prompting strategy based on problem characteristics.
@@ -578,15 +686,13 @@ class ActivePrompt(PromptTechnique):
         else:
             strategy = "comprehensive problem-solving approach"
 
-        complexity_guidance = {
-            "low": "Focus on clear, direct reasoning steps",
-            "medium": "Balance thoroughness with efficiency",
-            "high": "Use comprehensive analysis with multiple verification steps",
-        }.get(complexity_level, "Balance thoroughness with efficiency")
+        complexity_guidance = _ACTIVE_PROMPT_COMPLEXITY_GUIDANCE.get(
+            complexity_level, "Balance thoroughness with efficiency"
+        )
 
         skills_text = ", ".join(required_skills)
 
-        prompt = dedent_prompt(f"""
+        prompt = dedent_method_prompt(f"""
         Problem: {input_text}
         
         Problem Analysis:
@@ -608,6 +714,13 @@ class ActivePrompt(PromptTechnique):
         return prompt
 
 
+_DEPTH_GUIDANCE = {
+    "shallow": "Generate 2-3 key reasoning steps",
+    "standard": "Generate 4-5 comprehensive reasoning steps",
+    "deep": "Generate 6+ detailed reasoning steps with sub-analysis",
+}
+
+
 class AutoCoT(PromptTechnique):
     """
     Auto-CoT automatically generates chain-of-thought reasoning.
@@ -624,27 +737,29 @@ class AutoCoT(PromptTechnique):
             description="Automatically generates chain-of-thought reasoning.",
         )
 
-    def generate_prompt(self, input_text: str, **kwargs) -> str:
+    def generate_prompt(
+        self,
+        input_text: str,
+        *,
+        reasoning_depth: str = "standard",
+        auto_verification: bool = True,
+        **kwargs,
+    ) -> str:
         """
         Generate an auto-CoT prompt.
 
         Args:
             input_text (str): Input text
-            **kwargs: Additional arguments
-                - reasoning_depth (str): Depth of automatic reasoning
-                - auto_verification (bool): Whether to include automatic verification
+            reasoning_depth (str): Depth of automatic reasoning
+            auto_verification (bool): Whether to include automatic verification
+            **kwargs: Unused; accepted so techniques can share arguments.
 
         Returns:
             str: Generated auto-CoT prompt
         """
-        reasoning_depth = kwargs.get("reasoning_depth", "standard")
-        auto_verification = kwargs.get("auto_verification", True)
-
-        depth_guidance = {
-            "shallow": "Generate 2-3 key reasoning steps",
-            "standard": "Generate 4-5 comprehensive reasoning steps",
-            "deep": "Generate 6+ detailed reasoning steps with sub-analysis",
-        }.get(reasoning_depth, "Generate 4-5 comprehensive reasoning steps")
+        depth_guidance = _DEPTH_GUIDANCE.get(
+            reasoning_depth, "Generate 4-5 comprehensive reasoning steps"
+        )
 
         verification_text = (
             """
@@ -658,7 +773,7 @@ class AutoCoT(PromptTechnique):
             else ""
         )
 
-        prompt = dedent_prompt(f"""
+        prompt = dedent_method_prompt(f"""
         Problem: {input_text}
         
         I'll automatically generate a comprehensive reasoning chain for this problem.
@@ -732,7 +847,7 @@ class ComplexityBased(PromptTechnique):
         else:
             approach = "Deep, multi-layered reasoning with comprehensive analysis"
 
-        prompt = dedent_prompt(f"""
+        prompt = dedent_method_prompt(f"""
         Problem: {input_text}
         
         Complexity Assessment:
@@ -756,6 +871,29 @@ class Contrastive(PromptTechnique):
     and improve reasoning through comparative analysis.
     """
 
+    _template = dedent_prompt("""
+        Problem: {input_text}
+
+        I'll use contrastive reasoning to better understand this problem by examining different perspectives and approaches.
+
+        Contrastive Analysis:
+        {contrasts_text}
+
+        Systematic Comparison:
+        I'll analyze contrasts across these dimensions: {dimensions_text}
+
+        1. Primary Approach vs. Alternative Approaches
+        2. Key Assumptions vs. Different Assumptions  
+        3. Expected Outcomes vs. Alternative Outcomes
+        4. Advantages vs. Disadvantages
+
+        Synthesis:
+        Based on this contrastive analysis, what insights emerge?
+        What is the most robust solution considering all contrasts?
+
+        Final Answer:
+        """)
+
     def __init__(self):
         """Initialize Contrastive technique."""
         super().__init__(
@@ -764,23 +902,29 @@ class Contrastive(PromptTechnique):
             description="Uses contrasting examples or approaches for better understanding.",
         )
 
-    def generate_prompt(self, input_text: str, **kwargs) -> str:
+    def generate_prompt(
+        self,
+        input_text: str,
+        *,
+        contrast_examples: Optional[List[str]] = None,
+        contrast_dimensions: Optional[List[str]] = None,
+        **kwargs,
+    ) -> str:
         """
         Generate a contrastive prompt.
 
         Args:
             input_text (str): Input text
-            **kwargs: Additional arguments
-                - contrast_examples (List[str]): Specific contrasting examples
-                - contrast_dimensions (List[str]): Dimensions to contrast
+            contrast_examples (Optional[List[str]]): Specific contrasting examples
+            contrast_dimensions (Optional[List[str]]): Dimensions to contrast
+                (default: approach, assumptions and outcomes)
+            **kwargs: Unused; accepted so techniques can share arguments.
 
         Returns:
             str: Generated contrastive prompt
         """
-        contrast_examples = kwargs.get("contrast_examples", [])
-        contrast_dimensions = kwargs.get(
-            "contrast_dimensions", ["approach", "assumptions", "outcomes"]
-        )
+        if contrast_dimensions is None:
+            contrast_dimensions = ["approach", "assumptions", "outcomes"]
 
         if not contrast_examples:
             contrast_examples = [
@@ -792,29 +936,20 @@ class Contrastive(PromptTechnique):
         dimensions_text = ", ".join(contrast_dimensions)
         contrasts_text = "\n".join([f"- {example}" for example in contrast_examples])
 
-        prompt = dedent_prompt(f"""
-        Problem: {input_text}
-        
-        I'll use contrastive reasoning to better understand this problem by examining different perspectives and approaches.
-        
-        Contrastive Analysis:
-        {contrasts_text}
-        
-        Systematic Comparison:
-        I'll analyze contrasts across these dimensions: {dimensions_text}
-        
-        1. Primary Approach vs. Alternative Approaches
-        2. Key Assumptions vs. Different Assumptions  
-        3. Expected Outcomes vs. Alternative Outcomes
-        4. Advantages vs. Disadvantages
-        
-        Synthesis:
-        Based on this contrastive analysis, what insights emerge?
-        What is the most robust solution considering all contrasts?
-        
-        Final Answer:
-        """)
-        return prompt
+        return self._template.format_map(
+            {
+                "input_text": input_text,
+                "contrasts_text": contrasts_text,
+                "dimensions_text": dimensions_text,
+            }
+        )
+
+
+_REFERENCE_INSTRUCTION = {
+    "explicit": "Explicitly reference and build upon previous steps",
+    "implicit": "Implicitly maintain consistency with previous reasoning",
+    "summary": "Periodically summarize and reference key previous insights",
+}
 
 
 class MemoryOfThought(PromptTechnique):
@@ -825,6 +960,33 @@ class MemoryOfThought(PromptTechnique):
     to maintain consistency and build upon earlier insights.
     """
 
+    _template = (
+        dedent_prompt("""
+        I'll solve the problem below using Memory-of-Thought, maintaining awareness of previous reasoning steps.
+
+        Memory Management: {reference_instruction}
+        Memory Capacity: Track last {memory_capacity} reasoning steps
+
+        Step 1: [Initial analysis - MEMORY: Store key insights]
+
+        Step 2: [Building on Step 1 - MEMORY: Reference previous insights]
+
+        Step 3: [Further development - MEMORY: Integrate with Steps 1-2]
+
+        Step 4: [Advanced reasoning - MEMORY: Synthesize all previous steps]
+
+        Step 5: [Final solution - MEMORY: Validate against all previous reasoning]
+
+        Memory Summary:
+        [Key insights from all steps that inform the final answer]
+
+        Final Answer:
+        [Answer consistent with the memory summary]
+        """)
+        + _PROBLEM_TAIL
+        + "\n\nReasoning:"
+    )
+
     def __init__(self):
         """Initialize Memory-of-Thought technique."""
         super().__init__(
@@ -833,52 +995,44 @@ class MemoryOfThought(PromptTechnique):
             description="Maintains and references previous reasoning steps.",
         )
 
-    def generate_prompt(self, input_text: str, **kwargs) -> str:
+    def generate_prompt(
+        self,
+        input_text: str,
+        *,
+        memory_capacity: int = 5,
+        reference_style: str = "explicit",
+        **kwargs,
+    ) -> str:
         """
         Generate a memory-of-thought prompt.
 
         Args:
             input_text (str): Input text
-            **kwargs: Additional arguments
-                - memory_capacity (int): Number of previous steps to remember
-                - reference_style (str): How to reference previous steps
+            memory_capacity (int): Number of previous steps to remember
+            reference_style (str): How to reference previous steps
+            **kwargs: Unused; accepted so techniques can share arguments.
 
         Returns:
             str: Generated memory-of-thought prompt
         """
-        memory_capacity = kwargs.get("memory_capacity", 5)
-        reference_style = kwargs.get("reference_style", "explicit")
+        reference_instruction = _REFERENCE_INSTRUCTION.get(
+            reference_style, "Explicitly reference and build upon previous steps"
+        )
 
-        reference_instruction = {
-            "explicit": "Explicitly reference and build upon previous steps",
-            "implicit": "Implicitly maintain consistency with previous reasoning",
-            "summary": "Periodically summarize and reference key previous insights",
-        }.get(reference_style, "Explicitly reference and build upon previous steps")
+        return self._template.format_map(
+            {
+                "input_text": input_text,
+                "reference_instruction": reference_instruction,
+                "memory_capacity": memory_capacity,
+            }
+        )
 
-        prompt = dedent_prompt(f"""
-        Problem: {input_text}
-        
-        I'll solve this using Memory-of-Thought, maintaining awareness of previous reasoning steps.
-        
-        Memory Management: {reference_instruction}
-        Memory Capacity: Track last {memory_capacity} reasoning steps
-        
-        Step 1: [Initial analysis - MEMORY: Store key insights]
-        
-        Step 2: [Building on Step 1 - MEMORY: Reference previous insights]
-        
-        Step 3: [Further development - MEMORY: Integrate with Steps 1-2]
-        
-        Step 4: [Advanced reasoning - MEMORY: Synthesize all previous steps]
-        
-        Step 5: [Final solution - MEMORY: Validate against all previous reasoning]
-        
-        Memory Summary:
-        [Key insights from all steps that inform the final answer]
-        
-        Final Answer:
-        """)
-        return prompt
+
+_STRATEGY_GUIDANCE = {
+    "adaptive": "Dynamically adjust reasoning depth based on uncertainty",
+    "conservative": "Use thorough analysis for all uncertain aspects",
+    "efficient": "Focus detailed analysis only on highest uncertainty areas",
+}
 
 
 class UncertaintyRouted(PromptTechnique):
@@ -889,6 +1043,33 @@ class UncertaintyRouted(PromptTechnique):
     in different aspects of the problem, using more thorough analysis for uncertain areas.
     """
 
+    _template = (
+        dedent_prompt("""
+        I'll use Uncertainty-Routed reasoning to adapt my approach based on confidence levels.
+
+        Uncertainty Assessment:
+        1. Identify aspects with high uncertainty (>{uncertainty_threshold})
+        2. Identify aspects with low uncertainty (<{uncertainty_threshold})
+        3. Route reasoning depth accordingly
+
+        Routing Strategy: {strategy_guidance}
+
+        High Uncertainty Areas:
+        [Detailed analysis with multiple verification steps]
+
+        Medium Uncertainty Areas:
+        [Standard reasoning with validation checks]
+
+        Low Uncertainty Areas:
+        [Efficient reasoning with basic verification]
+
+        Uncertainty-Aware Solution:
+        [Final answer with confidence levels for different components]
+        """)
+        + _PROBLEM_TAIL
+        + "\n\nReasoning:"
+    )
+
     def __init__(self):
         """Initialize Uncertainty-Routed technique."""
         super().__init__(
@@ -897,52 +1078,40 @@ class UncertaintyRouted(PromptTechnique):
             description="Routes reasoning based on uncertainty levels.",
         )
 
-    def generate_prompt(self, input_text: str, **kwargs) -> str:
+    def generate_prompt(
+        self,
+        input_text: str,
+        *,
+        uncertainty_threshold: Optional[float] = None,
+        routing_strategy: str = "adaptive",
+        **kwargs,
+    ) -> str:
         """
         Generate an uncertainty-routed prompt.
 
         Args:
             input_text (str): Input text
-            **kwargs: Additional arguments
-                - uncertainty_threshold (float): Threshold for high uncertainty
-                - routing_strategy (str): Strategy for handling uncertainty
+            uncertainty_threshold (Optional[float]): Threshold for high
+                uncertainty (default: 0.7)
+            routing_strategy (str): Strategy for handling uncertainty
+            **kwargs: Unused; accepted so techniques can share arguments.
 
         Returns:
             str: Generated uncertainty-routed prompt
         """
-        uncertainty_threshold = kwargs.get("uncertainty_threshold", 0.7)
-        routing_strategy = kwargs.get("routing_strategy", "adaptive")
+        # Optional rather than a float default: mypyc cannot compile an unboxed
+        # float parameter overriding the base class's **kwargs.
+        if uncertainty_threshold is None:
+            uncertainty_threshold = 0.7
 
-        strategy_guidance = {
-            "adaptive": "Dynamically adjust reasoning depth based on uncertainty",
-            "conservative": "Use thorough analysis for all uncertain aspects",
-            "efficient": "Focus detailed analysis only on highest uncertainty areas",
-        }.get(
+        strategy_guidance = _STRATEGY_GUIDANCE.get(
             routing_strategy, "Dynamically adjust reasoning depth based on uncertainty"
         )
 
-        prompt = dedent_prompt(f"""
-        Problem: {input_text}
-        
-        I'll use Uncertainty-Routed reasoning to adapt my approach based on confidence levels.
-        
-        Uncertainty Assessment:
-        1. Identify aspects with high uncertainty (>{uncertainty_threshold})
-        2. Identify aspects with low uncertainty (<{uncertainty_threshold})
-        3. Route reasoning depth accordingly
-        
-        Routing Strategy: {strategy_guidance}
-        
-        High Uncertainty Areas:
-        [Detailed analysis with multiple verification steps]
-        
-        Medium Uncertainty Areas:
-        [Standard reasoning with validation checks]
-        
-        Low Uncertainty Areas:
-        [Efficient reasoning with basic verification]
-        
-        Uncertainty-Aware Solution:
-        [Final answer with confidence levels for different components]
-        """)
-        return prompt
+        return self._template.format_map(
+            {
+                "input_text": input_text,
+                "uncertainty_threshold": uncertainty_threshold,
+                "strategy_guidance": strategy_guidance,
+            }
+        )
@@ -2,37 +2,112 @@
 Utility functions for prompt techniques.
 """
 
+import os
 import textwrap
 import logging
+import functools
 import asyncio
 import time
-from typing import Dict, Any, Optional, Union, AsyncIterator, Iterator
-import litellm
-from litellm.exceptions import (
-    RateLimitError,
-    BadRequestError,
-    AuthenticationError,
-    ContextWindowExceededError,
-    ContentPolicyViolationError,
-    ServiceUnavailableError,
-    OpenAIError,
-    Timeout,
+import re
+import random
+import hashlib
+from collections import OrderedDict
+from typing import (
+    Dict,
+    Any,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    AsyncIterator,
+    Iterator,
+    Callable,
+    TYPE_CHECKING,
 )
 from rich.logging import RichHandler
 from .config import get_llm_config
+from .ratelimit import RateLimiter, get_rate_limiter
+
+if TYPE_CHECKING:
+    from .semantic_cache import SemanticCache
 
 # --- Logger Setup ---
-logging.basicConfig(
-    level="INFO",
-    format="%(message)s",
-    datefmt="[%X]",
-    handlers=[RichHandler(rich_tracebacks=True, markup=True)],
-)
+# Leave logging alone if the application has already configured it
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        format="%(message)s",
+        datefmt="[%X]",
+        handlers=[RichHandler(rich_tracebacks=True, markup=True)],
+    )
 
 log = logging.getLogger("rich")
+log.setLevel(os.environ.get("PROCTOR_LOG_LEVEL", "WARNING").upper())
+
+# LLM payloads are full of "[...]" placeholders; skip Rich markup parsing for them
+_NO_MARKUP = {"markup": False}
 # --- End Logger Setup ---
 
 
+# litellm pulls in a large dependency tree, so it is imported inside the
+# functions that make LLM calls rather than when proctor.utils is imported.
+def __getattr__(name: str) -> Any:
+    # Keep proctor.utils.litellm available (e.g. for mock.patch targets)
+    if name == "litellm":
+        import litellm
+
+        return litellm
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.lru_cache(maxsize=None)
+def _retryable_errors() -> Tuple[type, ...]:
+    """
+    Errors worth retrying with backoff.
+
+    Rate limits, provider outages and connection failures (including
+    timeouts) are transient. Anything else, such as a bad request, an
+    invalid key or an over-long context, fails the same way on every
+    attempt and is raised immediately.
+    """
+    from litellm.exceptions import (
+        APIConnectionError,
+        InternalServerError,
+        RateLimitError,
+        ServiceUnavailableError,
+        Timeout,
+    )
+
+    return (
+        RateLimitError,
+        ServiceUnavailableError,
+        InternalServerError,
+        APIConnectionError,
+        Timeout,
+    )
+
+
+# Exponential backoff delays in seconds, indexed by attempt number - 1
+_BACKOFFS = tuple(2**i for i in range(1, 8))
+
+# Upper bound on a server-requested Retry-After delay, in seconds
+_MAX_RETRY_AFTER = 120.0
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Return the delay requested by a Retry-After response header, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        headers = getattr(error, "litellm_response_headers", None)
+    if not headers:
+        return None
+    try:
+        value = float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        # Missing, or an HTTP date, which providers rarely send
+        return None
+    return min(max(value, 0.0), _MAX_RETRY_AFTER)
+
+
 def dedent_prompt(prompt: str) -> str:
     """
     Remove common leading whitespace from a multi-line prompt string.
@@ -46,12 +121,332 @@ def dedent_prompt(prompt: str) -> str:
     return textwrap.dedent(prompt).strip()
 
 
+# Body indentation of a triple-quoted prompt written inside a method
+_METHOD_INDENT = "\n" + " " * 8
+
+
+def dedent_method_prompt(prompt: str) -> str:
+    """
+    Dedent a prompt written as a triple-quoted string inside a method body.
+
+    Unlike dedent_prompt, this removes exactly eight spaces after each newline
+    in a single pass instead of computing the common margin, so multi-line
+    values interpolated into an f-string do not prevent the template lines
+    from being dedented.
+
+    Args:
+        prompt (str): The prompt string to dedent
+
+    Returns:
+        str: The dedented prompt
+    """
+    return prompt.replace(_METHOD_INDENT, "\n").strip()
+
+
+def require_nonempty_str(value: Any, name: str = "input_text") -> str:
+    """
+    Check that a prompt argument is a non-empty string.
+
+    Args:
+        value (Any): The value to check
+        name (str): Name used in the error message
+
+    Returns:
+        str: The value, unchanged
+
+    Raises:
+        ValueError: If value is not a string or is empty
+    """
+    if not isinstance(value, str) or not value:
+        raise ValueError(f"{name} must be a non-empty string")
+    return value
+
+
 class LLMError(Exception):
     """Exception raised for errors in LLM API calls."""
 
     pass
 
 
+def _resolve_config(config_override: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge config overrides over the base LLM configuration and validate it.
+
+    get_llm_config() returns a fresh dict on every call, so the result can be
+    used by the caller without affecting other calls.
+
+    Args:
+        config_override (Optional[Dict[str, Any]]): Override default config values
+
+    Returns:
+        Dict[str, Any]: The resolved configuration
+
+    Raises:
+        LLMError: If no API key is configured
+    """
+    config = get_llm_config()
+    if config_override:
+        config = {**config, **config_override}
+
+    # Validate required configuration
+    if not config.get("api_key"):
+        log.error("Missing API key in configuration")
+        raise LLMError(
+            "Missing API key. Please set OPENROUTER_API_KEY environment variable."
+        )
+    return config
+
+
+# Providers ignore cache markers on prefixes below a minimum size (about
+# 1024 tokens), so only system prompts longer than this many characters are
+# marked automatically; a marker on a short prefix is harmless
+_CACHEABLE_PREFIX_CHARS = 1024
+_CACHE_CONTROL_MODEL_PREFIXES = ("anthropic/", "openrouter/anthropic/")
+
+
+def _build_messages(
+    prompt: str, system_prompt: Optional[str], config: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Build the chat messages for an LLM call.
+
+    The system prompt is placed first so that it forms a stable prefix, with
+    line endings and trailing whitespace normalized so that equivalent
+    prompts are byte-identical. When ``config["cache_system_prompt"]`` is
+    set, it is sent as a content block carrying an ephemeral
+    ``cache_control`` marker, which litellm forwards to providers that
+    support prompt caching (e.g. Anthropic). If the option is not set, the
+    marker is added automatically for long system prompts to Anthropic
+    models; OpenAI models cache long prefixes without a marker.
+
+    Args:
+        prompt (str): The user prompt
+        system_prompt (Optional[str]): Optional system prompt
+        config (Dict[str, Any]): Resolved LLM configuration
+
+    Returns:
+        List[Dict[str, Any]]: Messages in chat-completion format
+    """
+    # The dicts are built fresh for every call rather than cached: litellm
+    # rewrites message content in place for some providers, so a shared
+    # message could leak one call's changes into the next.
+    user_message = {"role": "user", "content": prompt}
+    if not system_prompt:
+        return [user_message]
+
+    system_prompt = system_prompt.replace("\r\n", "\n").rstrip()
+    cache_system_prompt = config.get("cache_system_prompt")
+    if cache_system_prompt is None:
+        cache_system_prompt = len(system_prompt) > _CACHEABLE_PREFIX_CHARS and (
+            str(config.get("model", "")).startswith(_CACHE_CONTROL_MODEL_PREFIXES)
+        )
+
+    if cache_system_prompt:
+        system_content: Any = [
+            {
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+    else:
+        system_content = system_prompt
+    return [{"role": "system", "content": system_content}, user_message]
+
+
+def _prompt_cache_params(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extra completion parameters for prompt and response caching.
+
+    Args:
+        config (Dict[str, Any]): Resolved LLM configuration
+
+    Returns:
+        Dict[str, Any]: ``prompt_cache_key`` (used by OpenAI to route requests
+        sharing a prefix to the same cache) when configured, and
+        ``caching=True`` when a litellm response cache is installed
+    """
+    import litellm
+
+    params: Dict[str, Any] = {}
+    if config.get("prompt_cache_key"):
+        params["prompt_cache_key"] = config["prompt_cache_key"]
+    if litellm.cache is not None:
+        params["caching"] = True
+    return params
+
+
+def _completion_kwargs(
+    config: Dict[str, Any], messages: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Build the keyword arguments for litellm.completion / acompletion.
+
+    Args:
+        config (Dict[str, Any]): Resolved LLM configuration
+        messages (List[Dict[str, Any]]): Messages to send
+
+    Returns:
+        Dict[str, Any]: Arguments shared by every attempt of a call
+    """
+    kwargs = {
+        "model": config["model"],
+        "messages": messages,
+        "api_base": config["api_base"],
+        "api_key": config["api_key"],
+        "max_tokens": config.get("max_tokens", 1000),
+        "temperature": config.get("temperature", 0.7),
+        **_prompt_cache_params(config),
+    }
+    # For OpenRouter, we need to set custom_llm_provider
+    if "openrouter.ai" in config.get("api_base", ""):
+        kwargs["custom_llm_provider"] = "openrouter"
+    return kwargs
+
+
+def _rate_limit(
+    config: Dict[str, Any], messages: List[Dict[str, Any]]
+) -> Tuple[Optional[RateLimiter], int]:
+    """
+    Look up the rate limiter for a call and estimate the tokens it will use.
+
+    Args:
+        config (Dict[str, Any]): Resolved LLM configuration
+        messages (List[Dict[str, Any]]): Messages to be sent
+
+    Returns:
+        Tuple[Optional[RateLimiter], int]: The limiter (None when no limits are
+        configured) and the prompt tokens plus completion budget of the call,
+        which is only estimated when a token limit is set
+    """
+    limiter = get_rate_limiter(config)
+    if limiter is None or limiter.tokens is None:
+        return limiter, 0
+
+    import litellm
+
+    try:
+        prompt_tokens = litellm.token_counter(model=config["model"], messages=messages)
+    except Exception:
+        # Unknown model or tokenizer; fall back to ~4 characters per token
+        prompt_tokens = sum(len(str(m["content"])) for m in messages) // 4
+    return limiter, prompt_tokens + config.get("max_tokens", 1000)
+
+
+def enable_disk_cache(cache_dir: Optional[str] = None) -> None:
+    """
+    Persist LLM responses on disk so identical calls are reused across processes.
+
+    This installs a litellm disk cache, so a long reasoning run that is
+    restarted replays completed calls from disk instead of the provider. It is
+    also enabled at import time when ``PROCTOR_DISK_CACHE=1`` is set. Requires
+    the optional ``diskcache`` package.
+
+    Args:
+        cache_dir (Optional[str]): Cache directory. Defaults to the
+            ``PROCTOR_CACHE_DIR`` environment variable, or ``.proctor_cache``.
+    """
+    import litellm
+    from litellm.caching import Cache
+
+    if cache_dir is None:
+        cache_dir = os.environ.get("PROCTOR_CACHE_DIR", ".proctor_cache")
+    litellm.cache = Cache(type="disk", disk_cache_dir=cache_dir)
+    log.info("LLM disk cache enabled at [cyan]%s[/]", cache_dir)
+
+
+def enable_redis_cache(
+    host: Optional[str] = None,
+    port: Optional[str] = None,
+    password: Optional[str] = None,
+    ttl: Optional[float] = 3600,
+) -> None:
+    """
+    Share LLM responses between processes and machines through Redis.
+
+    Like enable_disk_cache, this installs a litellm response cache that
+    covers sync, async and streaming calls, but every worker pointing at the
+    same Redis server reuses the others' responses. It is also enabled at
+    import time when ``PROCTOR_REDIS_CACHE=1`` is set. Requires the optional
+    ``redis`` package.
+
+    Args:
+        host (Optional[str]): Redis host. Defaults to ``REDIS_HOST``.
+        port (Optional[str]): Redis port. Defaults to ``REDIS_PORT``.
+        password (Optional[str]): Redis password. Defaults to ``REDIS_PASSWORD``.
+        ttl (Optional[float]): Seconds to keep each response; None keeps
+            responses until Redis evicts them
+    """
+    import litellm
+    from litellm.caching import Cache
+
+    litellm.cache = Cache(
+        type="redis",
+        host=host or os.environ.get("REDIS_HOST"),
+        port=port or os.environ.get("REDIS_PORT"),
+        password=password or os.environ.get("REDIS_PASSWORD"),
+        ttl=ttl,
+    )
+    log.info("LLM Redis cache enabled.")
+
+
+# Whether _close_http_connection_pool has been registered to run at exit
+_http_pool_close_registered = False
+
+
+def _close_http_connection_pool() -> None:
+    """Close the shared HTTP client installed for litellm, if any."""
+    import httpx
+    import litellm
+
+    client = litellm.client_session
+    if isinstance(client, httpx.Client):
+        client.close()
+
+
+def enable_http_connection_pool(
+    http2: bool = False,
+    max_connections: int = 256,
+    max_keepalive_connections: int = 64,
+) -> None:
+    """
+    Route synchronous LLM calls through one shared, keep-alive HTTP client.
+
+    Reusing connections avoids a TCP and TLS handshake per call, which
+    dominates latency for short prompts. Only the synchronous client is
+    shared: an ``httpx.AsyncClient`` is bound to the event loop it was first
+    used in, while call_llm_batch starts a new loop per batch, and litellm
+    already reuses its async clients within a loop.
+
+    Args:
+        http2 (bool): Negotiate HTTP/2; requires the ``h2`` package
+        max_connections (int): Maximum number of open connections
+        max_keepalive_connections (int): Maximum number of idle connections kept
+    """
+    global _http_pool_close_registered
+    import atexit
+    import httpx
+    import litellm
+
+    client = httpx.Client(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        ),
+    )
+    previous = litellm.client_session
+    litellm.client_session = client
+    # One hook closes whichever client is current at exit, so replaced
+    # clients are not kept alive by hooks of their own
+    if not _http_pool_close_registered:
+        atexit.register(_close_http_connection_pool)
+        _http_pool_close_registered = True
+    if isinstance(previous, httpx.Client):
+        previous.close()
+    log.info("Shared HTTP connection pool enabled for LLM calls.")
+
+
 def call_llm(
     prompt: str,
     system_prompt: Optional[str] = None,
@@ -61,6 +456,14 @@ def call_llm(
     """
     Call the LLM with the given prompt using litellm with openrouter.
 
+    Responses for deterministic calls (``temperature == 0``) are kept in an
+    in-process LRU cache for an hour; set ``"cache"`` in the config to force
+    caching on or off, and use clear_llm_cache() to reset it.
+
+    The calling thread is blocked for the whole call, including the backoff
+    between retries. In async web handlers, await call_llm_async instead so
+    the worker keeps serving other requests while this one waits.
+
     Args:
         prompt (str): The user prompt to send
         system_prompt (Optional[str]): Optional system prompt to use
@@ -73,106 +476,298 @@ def call_llm(
     Raises:
         LLMError: If there are persistent issues with the LLM call after retries
     """
-    if not prompt or not isinstance(prompt, str):
-        raise ValueError("Prompt must be a non-empty string")
+    require_nonempty_str(prompt, "Prompt")
 
-    config = get_llm_config()
+    config = _resolve_config(config_override)
 
-    # Apply config overrides if provided
-    if config_override:
-        config.update(config_override)
+    # Deterministic calls are served from an in-process cache, so repeated
+    # prompts (e.g. when re-exploring reasoning branches) skip the network.
+    content, key, semantic = _cached_response(prompt, system_prompt, config)
+    if content is not None:
+        return content
 
-    # Validate required configuration
-    if not config.get("api_key"):
-        log.error("Missing API key in configuration")
-        raise LLMError(
-            "Missing API key. Please set OPENROUTER_API_KEY environment variable."
+    content = _call_llm_uncached(prompt, system_prompt, config, max_retries)
+    _store_response(key, semantic, prompt, system_prompt, config, content)
+    return content
+
+
+# In-process cache of LLM responses: key -> (time stored, response content)
+_RESPONSE_CACHE: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_CACHE_MAX = 1024
+_CACHE_TTL = 3600  # seconds
+
+
+def _use_response_cache(config: Dict[str, Any]) -> bool:
+    """
+    Whether a call with this configuration may be served from the response cache.
+
+    ``config["cache"]`` forces caching on or off; by default only deterministic
+    calls (``temperature == 0``) are cached.
+    """
+    cache = config.get("cache")
+    if cache is None:
+        return config.get("temperature", 0.7) == 0
+    return bool(cache)
+
+
+def _response_cache_key(
+    prompt: str, system_prompt: Optional[str], config: Dict[str, Any]
+) -> str:
+    """Hash the parts of a request that determine the response."""
+    # The prompts are hashed as raw bytes rather than serialized with the
+    # other fields: escaping a long prompt costs several times more than
+    # hashing it, and the key is computed on every cache hit.
+    system = (system_prompt or "").encode("utf-8", "surrogatepass")
+    params = (
+        config.get("model"),
+        config.get("api_base"),
+        config.get("temperature", 0.7),
+        config.get("max_tokens", 1000),
+        system_prompt is not None,
+        len(system),
+    )
+    digest = hashlib.blake2b(repr(params).encode(), digest_size=16)
+    digest.update(system)
+    digest.update(prompt.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+def _response_cache_get(key: str) -> Optional[str]:
+    """Return a cached response that has not expired, or None."""
+    entry = _RESPONSE_CACHE.get(key)
+    if entry is None:
+        return None
+    stored_at, content = entry
+    if time.monotonic() - stored_at > _CACHE_TTL:
+        _RESPONSE_CACHE.pop(key, None)
+        return None
+    _RESPONSE_CACHE.move_to_end(key)
+    log.info("Serving LLM response from cache.")
+    return content
+
+
+def _response_cache_put(key: str, content: Optional[str]) -> None:
+    """Store a response, evicting the least recently used entries when full."""
+    if content is None:
+        return
+    _RESPONSE_CACHE[key] = (time.monotonic(), content)
+    _RESPONSE_CACHE.move_to_end(key)
+    while len(_RESPONSE_CACHE) > _CACHE_MAX:
+        _RESPONSE_CACHE.popitem(last=False)
+
+
+def clear_llm_cache() -> None:
+    """Clear the in-memory cache of LLM responses."""
+    _RESPONSE_CACHE.clear()
+
+
+# Optional similarity-based cache consulted after the exact-match cache
+_semantic_cache: Optional["SemanticCache"] = None
+
+
+def set_semantic_cache(cache: Optional["SemanticCache"]) -> None:
+    """
+    Install a semantic cache for call_llm and call_llm_async.
+
+    When set, prompts similar enough to a previously answered one (with the
+    same model and system prompt) are served from the cache. Like the
+    exact-match cache, it is only used for deterministic calls unless
+    ``"cache"`` in the config forces caching on or off. Pass None to
+    remove it.
+
+    Args:
+        cache (Optional[SemanticCache]): A proctor.semantic_cache.SemanticCache
+    """
+    global _semantic_cache
+    _semantic_cache = cache
+
+
+def _cached_response(
+    prompt: str, system_prompt: Optional[str], config: Dict[str, Any]
+) -> Tuple[Optional[str], Optional[str], Optional[Tuple["SemanticCache", Any]]]:
+    """
+    Look a call up in the response cache, then in the semantic cache.
+
+    Returns:
+        Tuple: The cached content (None on a miss), the response-cache key to
+        store the result under (None if the call is not cacheable), and the
+        semantic cache consulted with the prompt's embedding (None if none
+        was), so that storing a miss does not embed the prompt again
+    """
+    if not _use_response_cache(config):
+        return None, None, None
+
+    key = _response_cache_key(prompt, system_prompt, config)
+    content = _response_cache_get(key)
+    if content is not None:
+        return content, key, None
+
+    semantic_cache = _semantic_cache
+    if semantic_cache is None:
+        return None, key, None
+    content, embedding = semantic_cache.lookup(
+        prompt, system_prompt, config.get("model")
+    )
+    return content, key, (semantic_cache, embedding)
+
+
+def _store_response(
+    key: Optional[str],
+    semantic: Optional[Tuple["SemanticCache", Any]],
+    prompt: str,
+    system_prompt: Optional[str],
+    config: Dict[str, Any],
+    content: Optional[str],
+) -> None:
+    """Store a fresh response in the caches that _cached_response consulted."""
+    if key is None:
+        return
+    _response_cache_put(key, content)
+    if semantic is not None and content is not None:
+        semantic_cache, embedding = semantic
+        semantic_cache.put(
+            prompt, content, system_prompt, config.get("model"), embedding=embedding
         )
 
-    messages = []
 
-    if system_prompt:
-        messages.append({"role": "system", "content": system_prompt})
+def _prepare_call(
+    prompt: str,
+    system_prompt: Optional[str],
+    config: Dict[str, Any],
+    description: str,
+) -> Tuple[Dict[str, Any], Optional[RateLimiter], int]:
+    """
+    Build the completion request shared by the sync and async call paths.
 
-    messages.append({"role": "user", "content": prompt})
+    Args:
+        prompt (str): The user prompt to send
+        system_prompt (Optional[str]): Optional system prompt to use
+        config (Dict[str, Any]): Resolved LLM configuration
+        description (str): Suffix for the log line, e.g. " asynchronously"
 
-    log.info("Attempting to call LLM...")
-    log.debug(f"LLM Config: {config}")
-    log.debug(f"Messages: {messages}")
+    Returns:
+        Tuple[Dict[str, Any], Optional[RateLimiter], int]: The litellm keyword
+        arguments, the rate limiter to acquire (if any) and the tokens to
+        acquire from it
+    """
+    messages = _build_messages(prompt, system_prompt, config)
+    request = _completion_kwargs(config, messages)
+    limiter, tokens = _rate_limit(config, messages)
 
-    # Track retry attempts
-    attempts = 0
-    last_error = None
+    log.debug("Attempting to call LLM%s...", description)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("LLM Config: %s", config, extra=_NO_MARKUP)
+        log.debug("Messages: %s", messages, extra=_NO_MARKUP)
 
-    while attempts <= max_retries:
-        try:
-            # For OpenRouter, we need to set custom_llm_provider
-            if "openrouter.ai" in config.get("api_base", ""):
-                response = litellm.completion(
-                    model=config["model"],
-                    messages=messages,
-                    api_base=config["api_base"],
-                    api_key=config["api_key"],
-                    max_tokens=config.get("max_tokens", 1000),
-                    temperature=config.get("temperature", 0.7),
-                    custom_llm_provider="openrouter",
-                )
-            else:
-                response = litellm.completion(
-                    model=config["model"],
-                    messages=messages,
-                    api_base=config["api_base"],
-                    api_key=config["api_key"],
-                    max_tokens=config.get("max_tokens", 1000),
-                    temperature=config.get("temperature", 0.7),
-                )
-
-            log.debug(f"Raw LLM Response object: {response}")
-
-            # Process response
-            if response.choices and response.choices[0].message:
-                content = response.choices[0].message.content
-                log.info("LLM call successful.")
-                return content
-            else:
-                log.error("Received unexpected response format from LLM.")
-                log.error(f"Response object: {response}")
-                raise LLMError("Unexpected response format from LLM")
-
-        except (
-            litellm.exceptions.RateLimitError,
-            litellm.exceptions.BadRequestError,
-            litellm.exceptions.OpenAIError,
-            litellm.exceptions.ServiceUnavailableError,
-        ) as e:
-            # These are potentially retryable errors
-            last_error = e
-            attempts += 1
+    return request, limiter, tokens
 
-            if attempts <= max_retries:
-                retry_delay = 2**attempts  # Exponential backoff
-                log.warning(
-                    f"Retryable error: {str(e)}. Retrying in {retry_delay}s... (Attempt {attempts}/{max_retries})"
-                )
-                import time
 
-                time.sleep(retry_delay)
-            else:
-                # Max retries exceeded
-                break
+def _response_content(response: Any) -> str:
+    """
+    Extract the message content from a completion response.
+
+    Raises:
+        LLMError: If the response has no message
+    """
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Raw LLM Response object: %s", response, extra=_NO_MARKUP)
+
+    if response.choices and response.choices[0].message:
+        log.debug("LLM call successful.")
+        if log.isEnabledFor(logging.DEBUG):
+            details = getattr(
+                getattr(response, "usage", None), "prompt_tokens_details", None
+            )
+            log.debug(
+                "Prompt tokens served from provider cache: %s",
+                getattr(details, "cached_tokens", None),
+            )
+        return response.choices[0].message.content
+
+    log.error("Received unexpected response format from LLM.")
+    log.error("Response object: %s", response, extra=_NO_MARKUP)
+    raise LLMError("Unexpected response format from LLM")
+
+
+def _retry_delay(error: Exception, attempts: int, max_retries: int) -> float:
+    """
+    Return how long to back off before retrying after a retryable error.
+
+    A Retry-After header sent with the error is honored; otherwise the
+    exponential backoff delay is randomized by +/-50%.
+
+    Args:
+        error (Exception): The retryable error
+        attempts (int): Number of failed attempts so far, including this one
+        max_retries (int): Maximum number of retry attempts
+
+    Returns:
+        float: Seconds to wait before the next attempt
+
+    Raises:
+        LLMError: If the retries are used up
+    """
+    if attempts > max_retries:
+        log.error("Failed after %d retries: %s", max_retries, error)
+        raise LLMError(f"Error after {max_retries} retries: {str(error)}")
+
+    retry_delay = _retry_after(error)
+    if retry_delay is None:
+        # Jitter spreads out retries from concurrent calls that failed together
+        retry_delay = _BACKOFFS[min(attempts, len(_BACKOFFS)) - 1] * (
+            0.5 + random.random()
+        )
+    log.warning(
+        "Retryable error: %s. Retrying in %.1fs... (Attempt %d/%d)",
+        error,
+        retry_delay,
+        attempts,
+        max_retries,
+    )
+    return retry_delay
+
+
+def _call_llm_uncached(
+    prompt: str,
+    system_prompt: Optional[str],
+    config: Dict[str, Any],
+    max_retries: int,
+) -> str:
+    """
+    Perform a synchronous LLM call with retries, bypassing the response cache.
+
+    Args:
+        prompt (str): The user prompt to send
+        system_prompt (Optional[str]): Optional system prompt to use
+        config (Dict[str, Any]): Resolved LLM configuration
+        max_retries (int): Maximum number of retry attempts for transient errors
+
+    Returns:
+        str: The LLM response content
+
+    Raises:
+        LLMError: If there are persistent issues with the LLM call after retries
+    """
+    import litellm
+
+    request, limiter, tokens = _prepare_call(prompt, system_prompt, config, "")
+
+    attempts = 0
+    while True:
+        try:
+            if limiter is not None:
+                limiter.acquire(tokens)
+            return _response_content(litellm.completion(**request))
+
+        except _retryable_errors() as e:
+            attempts += 1
+            time.sleep(_retry_delay(e, attempts, max_retries))
 
         except Exception as e:
             # Non-retryable error
-            log.exception(f"Non-retryable error calling LLM: {e}")
-            raise LLMError(f"Error calling LLM: {str(e)}")
-
-    # If we've exhausted retries
-    if last_error:
-        log.error(f"Failed after {max_retries} retries: {str(last_error)}")
-        raise LLMError(f"Error after {max_retries} retries: {str(last_error)}")
+            log.exception("Non-retryable error calling LLM: %s", e)
+            raise LLMError(f"Error calling LLM: {str(e)}") from e
 
-    # Fallback error (should not reach here)
-    raise LLMError("Unknown error occurred when calling LLM")
 
 async def call_llm_async(
     prompt: str,
@@ -183,6 +778,8 @@ async def call_llm_async(
     """
     Asynchronous version of call_llm using litellm.acompletion.
 
+    Shares the response cache of call_llm.
+
     Args:
         prompt (str): The user prompt to send
         system_prompt (Optional[str]): Optional system prompt to use
@@ -195,111 +792,307 @@ async def call_llm_async(
     Raises:
         LLMError: If there are persistent issues with the LLM call after retries
     """
-    if not prompt or not isinstance(prompt, str):
-        raise ValueError("Prompt must be a non-empty string")
+    require_nonempty_str(prompt, "Prompt")
 
-    config = get_llm_config()
+    config = _resolve_config(config_override)
 
-    # Apply config overrides if provided
-    if config_override:
-        config.update(config_override)
+    content, key, semantic = _cached_response(prompt, system_prompt, config)
+    if content is not None:
+        return content
 
-    # Validate required configuration
-    if not config.get("api_key"):
-        log.error("Missing API key in configuration")
-        raise LLMError(
-            "Missing API key. Please set OPENROUTER_API_KEY environment variable."
-        )
+    content = await _call_llm_async_uncached(prompt, system_prompt, config, max_retries)
+    _store_response(key, semantic, prompt, system_prompt, config, content)
+    return content
 
-    messages = []
 
-    if system_prompt:
-        messages.append({"role": "system", "content": system_prompt})
+async def _call_llm_async_uncached(
+    prompt: str,
+    system_prompt: Optional[str],
+    config: Dict[str, Any],
+    max_retries: int,
+) -> str:
+    """
+    Perform an asynchronous LLM call with retries, bypassing the response cache.
 
-    messages.append({"role": "user", "content": prompt})
+    Mirrors _call_llm_uncached; only the I/O (the completion call, rate
+    limiting and backoff sleeps) differs between the two.
 
-    log.info("Attempting to call LLM asynchronously...")
-    log.debug(f"LLM Config: {config}")
-    log.debug(f"Messages: {messages}")
+    Args:
+        prompt (str): The user prompt to send
+        system_prompt (Optional[str]): Optional system prompt to use
+        config (Dict[str, Any]): Resolved LLM configuration
+        max_retries (int): Maximum number of retry attempts for transient errors
 
-    # Track retry attempts
-    attempts = 0
-    last_error = None
+    Returns:
+        str: The LLM response content
+
+    Raises:
+        LLMError: If there are persistent issues with the LLM call after retries
+    """
+    import litellm
 
-    while attempts <= max_retries:
+    request, limiter, tokens = _prepare_call(
+        prompt, system_prompt, config, " asynchronously"
+    )
+
+    attempts = 0
+    while True:
         try:
-            # For OpenRouter, we need to set custom_llm_provider
-            if "openrouter.ai" in config.get("api_base", ""):
-                response = await litellm.acompletion(
-                    model=config["model"],
-                    messages=messages,
-                    api_base=config["api_base"],
-                    api_key=config["api_key"],
-                    max_tokens=config.get("max_tokens", 1000),
-                    temperature=config.get("temperature", 0.7),
-                    custom_llm_provider="openrouter",
-                )
-            else:
-                response = await litellm.acompletion(
-                    model=config["model"],
-                    messages=messages,
-                    api_base=config["api_base"],
-                    api_key=config["api_key"],
-                    max_tokens=config.get("max_tokens", 1000),
-                    temperature=config.get("temperature", 0.7),
-                )
-
-            log.debug(f"Raw LLM Response object: {response}")
-
-            # Process response
-            if response.choices and response.choices[0].message:
-                content = response.choices[0].message.content
-                log.info("LLM call successful.")
-                return content
-            else:
-                log.error("Received unexpected response format from LLM.")
-                log.error(f"Response object: {response}")
-                raise LLMError("Unexpected response format from LLM")
-
-        except (
-            RateLimitError,
-            BadRequestError,
-            OpenAIError,
-            ServiceUnavailableError,
-            Timeout,
-        ) as e:
-            # These are potentially retryable errors
-            last_error = e
-            attempts += 1
+            if limiter is not None:
+                await limiter.acquire_async(tokens)
+            return _response_content(await litellm.acompletion(**request))
 
-            if attempts <= max_retries:
-                retry_delay = 2**attempts  # Exponential backoff
-                log.warning(
-                    f"Retryable error: {str(e)}. Retrying in {retry_delay}s... (Attempt {attempts}/{max_retries})"
-                )
-                await asyncio.sleep(retry_delay)
-            else:
-                # Max retries exceeded
-                break
+        except _retryable_errors() as e:
+            attempts += 1
+            await asyncio.sleep(_retry_delay(e, attempts, max_retries))
 
         except Exception as e:
             # Non-retryable error
-            log.exception(f"Non-retryable error calling LLM: {e}")
-            raise LLMError(f"Error calling LLM: {str(e)}")
+            log.exception("Non-retryable error calling LLM: %s", e)
+            raise LLMError(f"Error calling LLM: {str(e)}") from e
 
-    # If we've exhausted retries
-    if last_error:
-        log.error(f"Failed after {max_retries} retries: {str(last_error)}")
-        raise LLMError(f"Error after {max_retries} retries: {str(last_error)}")
 
-    # Fallback error (should not reach here)
-    raise LLMError("Unknown error occurred when calling LLM")
+async def call_llm_batch_async(
+    prompts: List[str],
+    system_prompt: Optional[str] = None,
+    config_override: Optional[Dict[str, Any]] = None,
+    max_retries: int = 2,
+    concurrency: int = 8,
+    return_exceptions: bool = False,
+) -> List[Union[str, LLMError]]:
+    """
+    Asynchronously call the LLM for several prompts concurrently.
+
+    Requests are issued through call_llm_async, so retries and backoff behave
+    the same as for single calls, while up to ``concurrency`` requests are in
+    flight at once. Raise ``concurrency`` to use more of the provider's
+    request rate; lower it if calls start hitting rate limits.
+
+    Args:
+        prompts (List[str]): The user prompts to send
+        system_prompt (Optional[str]): Optional system prompt shared by all calls
+        config_override (Optional[Dict[str, Any]]): Override default config values
+        max_retries (int): Maximum number of retry attempts for transient errors
+        concurrency (int): Maximum number of concurrent requests
+        return_exceptions (bool): If True, a failed call does not abort the
+            batch; its slot in the result holds an LLMError instead
+
+    Returns:
+        List[Union[str, LLMError]]: The LLM responses, in the same order as
+        ``prompts``
+
+    Raises:
+        ValueError: If concurrency is less than 1
+        LLMError: If any of the LLM calls fails and return_exceptions is False
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _bounded_call(prompt: str) -> str:
+        async with semaphore:
+            return await call_llm_async(
+                prompt, system_prompt, config_override, max_retries
+            )
+
+    results = await asyncio.gather(
+        *(_bounded_call(p) for p in prompts), return_exceptions=return_exceptions
+    )
+    if return_exceptions:
+        return [
+            LLMError(str(result))
+            if isinstance(result, Exception) and not isinstance(result, LLMError)
+            else result
+            for result in results
+        ]
+    return list(results)
+
+
+def call_llm_batch(
+    prompts: List[str],
+    system_prompt: Optional[str] = None,
+    config_override: Optional[Dict[str, Any]] = None,
+    max_retries: int = 2,
+    concurrency: int = 8,
+    return_exceptions: bool = False,
+) -> List[Union[str, LLMError]]:
+    """
+    Call the LLM for several prompts concurrently.
+
+    Synchronous wrapper around call_llm_batch_async. This must not be called
+    from a running event loop; await call_llm_batch_async there instead.
+
+    Args:
+        prompts (List[str]): The user prompts to send
+        system_prompt (Optional[str]): Optional system prompt shared by all calls
+        config_override (Optional[Dict[str, Any]]): Override default config values
+        max_retries (int): Maximum number of retry attempts for transient errors
+        concurrency (int): Maximum number of concurrent requests
+        return_exceptions (bool): If True, a failed call does not abort the
+            batch; its slot in the result holds an LLMError instead
+
+    Returns:
+        List[Union[str, LLMError]]: The LLM responses, in the same order as
+        ``prompts``
+
+    Raises:
+        ValueError: If concurrency is less than 1
+        LLMError: If any of the LLM calls fails and return_exceptions is False
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    return asyncio.run(
+        call_llm_batch_async(
+            prompts,
+            system_prompt,
+            config_override,
+            max_retries,
+            concurrency,
+            return_exceptions,
+        )
+    )
+
+
+# Separator between answers in a marshalled response
+_MARSHAL_SEPARATOR = "###"
+_MARSHAL_SPLIT = re.compile(r"^\s*###\s*$", re.MULTILINE)
+_MARSHAL_NUMBER = re.compile(r"^\d+[.)]\s*")
+
+
+def _marshal_prompts(prompts: List[str]) -> str:
+    """Combine prompts into one numbered request."""
+    questions = "\n".join(f"{i}. {prompt}" for i, prompt in enumerate(prompts, 1))
+    return (
+        f"Answer each numbered question independently, in order. Separate "
+        f"consecutive answers with a line containing only "
+        f"'{_MARSHAL_SEPARATOR}'. Do not repeat the questions.\n\n{questions}"
+    )
+
+
+def _unmarshal_response(response: str) -> List[str]:
+    """Split a marshalled response into its answers."""
+    answers = [part.strip() for part in _MARSHAL_SPLIT.split(response or "")]
+    return [_MARSHAL_NUMBER.sub("", answer, count=1) for answer in answers if answer]
+
+
+def call_llm_marshalled(
+    prompts: List[str],
+    k: int = 8,
+    system_prompt: Optional[str] = None,
+    config_override: Optional[Dict[str, Any]] = None,
+    max_retries: int = 2,
+    concurrency: int = 8,
+) -> List[str]:
+    """
+    Answer several independent prompts with ``k`` prompts per request.
+
+    When a provider's requests-per-minute limit is the bottleneck, packing
+    prompts into one numbered request multiplies the work done per request.
+    Groups are sent concurrently through call_llm_batch. If a response does
+    not split into the expected number of answers, the prompts of that group
+    are sent individually instead. Suitable for short, independent prompts;
+    answers may be less careful than separate calls. Like call_llm_batch,
+    this must not be called from a running event loop.
+
+    Args:
+        prompts (List[str]): The user prompts to answer
+        k (int): Number of prompts per request; 4-16 is typically a good range
+        system_prompt (Optional[str]): Optional system prompt shared by all calls
+        config_override (Optional[Dict[str, Any]]): Override default config values
+        max_retries (int): Maximum number of retry attempts for transient errors
+        concurrency (int): Maximum number of concurrent requests
+
+    Returns:
+        List[str]: The answers, in the same order as ``prompts``
+
+    Raises:
+        ValueError: If k is less than 1 or a prompt is empty
+        LLMError: If any of the LLM calls fails
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    for prompt in prompts:
+        require_nonempty_str(prompt, "Prompt")
+    if not prompts:
+        return []
+
+    groups = [prompts[i : i + k] for i in range(0, len(prompts), k)]
+    responses = call_llm_batch(
+        [_marshal_prompts(group) if len(group) > 1 else group[0] for group in groups],
+        system_prompt,
+        config_override,
+        max_retries,
+        concurrency,
+    )
+
+    answers: List[str] = []
+    for group, response in zip(groups, responses):
+        if len(group) == 1:
+            answers.append(response)
+            continue
+        group_answers = _unmarshal_response(response)
+        if len(group_answers) != len(group):
+            log.warning(
+                "Marshalled response had %d answers for %d prompts; "
+                "falling back to individual calls.",
+                len(group_answers),
+                len(group),
+            )
+            group_answers = [
+                call_llm(prompt, system_prompt, config_override, max_retries)
+                for prompt in group
+            ]
+        answers.extend(group_answers)
+    return answers
+
+
+class _StreamBuffer:
+    """
+    Coalesce streamed text deltas into larger pieces.
+
+    Providers send roughly one token per event; yielding each one costs the
+    consumer a loop iteration (and an await for async streams). Deltas are
+    held until ``coalesce_ms`` have passed since the first buffered delta or
+    ``max_chars`` characters have accumulated, then released together.
+    """
+
+    def __init__(self, coalesce_ms: float, max_chars: int = 256):
+        self.coalesce = coalesce_ms / 1000
+        self.max_chars = max_chars
+        self._parts: List[str] = []
+        self._chars = 0
+        self._deadline = 0.0
+
+    def add(self, text: str) -> Optional[str]:
+        """Buffer a delta; return the buffered text if it is due to be released."""
+        if self.coalesce <= 0:
+            return text
+        if not self._parts:
+            self._deadline = time.monotonic() + self.coalesce
+        self._parts.append(text)
+        self._chars += len(text)
+        if self._chars >= self.max_chars or time.monotonic() >= self._deadline:
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[str]:
+        """Return and clear any buffered text."""
+        if not self._parts:
+            return None
+        text = "".join(self._parts)
+        self._parts.clear()
+        self._chars = 0
+        return text
 
 
 def call_llm_stream(
     prompt: str,
     system_prompt: Optional[str] = None,
     config_override: Optional[Dict[str, Any]] = None,
+    should_continue: Optional[Callable[[str], bool]] = None,
+    chunk_coalesce_ms: float = 25,
 ) -> Iterator[str]:
     """
     Call the LLM with streaming response.
@@ -308,70 +1101,66 @@ def call_llm_stream(
         prompt (str): The user prompt to send
         system_prompt (Optional[str]): Optional system prompt to use
         config_override (Optional[Dict[str, Any]]): Override default config values
+        should_continue (Optional[Callable[[str], bool]]): Called with the text
+            received so far after each chunk; returning False stops the stream
+            early and closes the underlying request. Closing the generator has
+            the same effect.
+        chunk_coalesce_ms (float): Deltas arriving within this many
+            milliseconds (up to 256 characters) are yielded together, which
+            saves the consumer per-token iterations. Pass 0 to yield every
+            delta as it arrives.
 
     Yields:
-        str: Chunks of the LLM response content
+        str: Pieces of the LLM response content
 
     Raises:
         LLMError: If there are issues with the LLM call
     """
-    if not prompt or not isinstance(prompt, str):
-        raise ValueError("Prompt must be a non-empty string")
+    require_nonempty_str(prompt, "Prompt")
 
-    config = get_llm_config()
+    config = _resolve_config(config_override)
 
-    # Apply config overrides if provided
-    if config_override:
-        config.update(config_override)
+    import litellm
 
-    # Validate required configuration
-    if not config.get("api_key"):
-        log.error("Missing API key in configuration")
-        raise LLMError(
-            "Missing API key. Please set OPENROUTER_API_KEY environment variable."
-        )
-
-    messages = []
-
-    if system_prompt:
-        messages.append({"role": "system", "content": system_prompt})
-
-    messages.append({"role": "user", "content": prompt})
-
-    log.info("Attempting to call LLM with streaming...")
-    log.debug(f"LLM Config: {config}")
-    log.debug(f"Messages: {messages}")
+    request, limiter, tokens = _prepare_call(
+        prompt, system_prompt, config, " with streaming"
+    )
 
     try:
-        # For OpenRouter, we need to set custom_llm_provider
-        if "openrouter.ai" in config.get("api_base", ""):
-            response = litellm.completion(
-                model=config["model"],
-                messages=messages,
-                api_base=config["api_base"],
-                api_key=config["api_key"],
-                max_tokens=config.get("max_tokens", 1000),
-                temperature=config.get("temperature", 0.7),
-                stream=True,
-                custom_llm_provider="openrouter",
-            )
-        else:
-            response = litellm.completion(
-                model=config["model"],
-                messages=messages,
-                api_base=config["api_base"],
-                api_key=config["api_key"],
-                max_tokens=config.get("max_tokens", 1000),
-                temperature=config.get("temperature", 0.7),
-                stream=True,
-            )
+        if limiter is not None:
+            limiter.acquire(tokens)
+
+        response = litellm.completion(**request, stream=True)
 
-        for chunk in response:
-            if chunk.choices and chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+        buffer = _StreamBuffer(chunk_coalesce_ms)
+        received = []
+        try:
+            for chunk in response:
+                # Read each chunk's fields once; they are pydantic attributes
+                choices = chunk.choices
+                delta = choices[0].delta.content if choices else None
+                if delta:
+                    content = buffer.add(delta)
+                    if content is None:
+                        continue
+                    yield content
+                    if should_continue is not None:
+                        received.append(content)
+                        if not should_continue("".join(received)):
+                            log.info("Stopping LLM stream early.")
+                            break
+            else:
+                content = buffer.flush()
+                if content is not None:
+                    yield content
+        finally:
+            # Release the HTTP connection when stopping before the end
+            close = getattr(response, "close", None)
+            if close is not None:
+                close()
 
     except Exception as e:
-        log.exception(f"Error during streaming LLM call: {e}")
+        log.exception("Error during streaming LLM call: %s", e)
         raise LLMError(f"Error during streaming: {str(e)}")
 
 
@@ -379,6 +1168,8 @@ async def call_llm_async_stream(
     prompt: str,
     system_prompt: Optional[str] = None,
     config_override: Optional[Dict[str, Any]] = None,
+    should_continue: Optional[Callable[[str], bool]] = None,
+    chunk_coalesce_ms: float = 25,
 ) -> AsyncIterator[str]:
     """
     Asynchronously call the LLM with streaming response.
@@ -387,68 +1178,70 @@ async def call_llm_async_stream(
         prompt (str): The user prompt to send
         system_prompt (Optional[str]): Optional system prompt to use
         config_override (Optional[Dict[str, Any]]): Override default config values
+        should_continue (Optional[Callable[[str], bool]]): Called with the text
+            received so far after each chunk; returning False stops the stream
+            early and closes the underlying request. Closing the generator has
+            the same effect.
+        chunk_coalesce_ms (float): Deltas arriving within this many
+            milliseconds (up to 256 characters) are yielded together, which
+            saves the consumer per-token iterations. Pass 0 to yield every
+            delta as it arrives.
 
     Yields:
-        str: Chunks of the LLM response content
+        str: Pieces of the LLM response content
 
     Raises:
         LLMError: If there are issues with the LLM call
     """
-    if not prompt or not isinstance(prompt, str):
-        raise ValueError("Prompt must be a non-empty string")
-
-    config = get_llm_config()
+    require_nonempty_str(prompt, "Prompt")
 
-    # Apply config overrides if provided
-    if config_override:
-        config.update(config_override)
+    config = _resolve_config(config_override)
 
-    # Validate required configuration
-    if not config.get("api_key"):
-        log.error("Missing API key in configuration")
-        raise LLMError(
-            "Missing API key. Please set OPENROUTER_API_KEY environment variable."
-        )
+    import litellm
 
-    messages = []
-
-    if system_prompt:
-        messages.append({"role": "system", "content": system_prompt})
-
-    messages.append({"role": "user", "content": prompt})
-
-    log.info("Attempting to call LLM asynchronously with streaming...")
-    log.debug(f"LLM Config: {config}")
-    log.debug(f"Messages: {messages}")
+    request, limiter, tokens = _prepare_call(
+        prompt, system_prompt, config, " asynchronously with streaming"
+    )
 
     try:
-        # For OpenRouter, we need to set custom_llm_provider
-        if "openrouter.ai" in config.get("api_base", ""):
-            response = await litellm.acompletion(
-                model=config["model"],
-                messages=messages,
-                api_base=config["api_base"],
-                api_key=config["api_key"],
-                max_tokens=config.get("max_tokens", 1000),
-                temperature=config.get("temperature", 0.7),
-                stream=True,
-                custom_llm_provider="openrouter",
-            )
-        else:
-            response = await litellm.acompletion(
-                model=config["model"],
-                messages=messages,
-                api_base=config["api_base"],
-                api_key=config["api_key"],
-                max_tokens=config.get("max_tokens", 1000),
-                temperature=config.get("temperature", 0.7),
-                stream=True,
-            )
+        if limiter is not None:
+            await limiter.acquire_async(tokens)
 
-        async for chunk in response:
-            if chunk.choices and chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+        response = await litellm.acompletion(**request, stream=True)
+
+        buffer = _StreamBuffer(chunk_coalesce_ms)
+        received = []
+        try:
+            async for chunk in response:
+                # Read each chunk's fields once; they are pydantic attributes
+                choices = chunk.choices
+                delta = choices[0].delta.content if choices else None
+                if delta:
+                    content = buffer.add(delta)
+                    if content is None:
+                        continue
+                    yield content
+                    if should_continue is not None:
+                        received.append(content)
+                        if not should_continue("".join(received)):
+                            log.info("Stopping LLM stream early.")
+                            break
+            else:
+                content = buffer.flush()
+                if content is not None:
+                    yield content
+        finally:
+            # Release the HTTP connection when stopping before the end
+            aclose = getattr(response, "aclose", None)
+            if aclose is not None:
+                await aclose()
 
     except Exception as e:
-        log.exception(f"Error during async streaming LLM call: {e}")
+        log.exception("Error during async streaming LLM call: %s", e)
         raise LLMError(f"Error during async streaming: {str(e)}")
+
+
+if os.environ.get("PROCTOR_REDIS_CACHE") == "1":
+    enable_redis_cache()
+elif os.environ.get("PROCTOR_DISK_CACHE") == "1":
+    enable_disk_cache()
@@ -2,11 +2,83 @@
 Implementation of Zero-Shot prompting techniques.
 """
 
+import functools
+from abc import abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
 from ..base import PromptTechnique
 from ..utils import dedent_prompt
 
 
-class EmotionPrompting(PromptTechnique):
+# Stands in for the input text while a template is bound to its options
+_INPUT_MARKER = "\x00input_text\x00"
+
+
+@functools.lru_cache(maxsize=1024, typed=True)
+def _bound_template(technique_cls, /, *args, **kwargs):
+    """Cache _ZeroShotTechnique._split results by technique class and options."""
+    return technique_cls._split(*args, **kwargs)
+
+
+class _ZeroShotTechnique(PromptTechnique):
+    """
+    Base for zero-shot techniques built from a single %-template.
+
+    Subclasses define ``_template`` and the ``_fields`` classmethod, which
+    resolves every template field except ``input_text`` from the prompt
+    options. The template is filled once per class and combination of
+    options and split around the input, so each prompt is the same prefix,
+    the input and the same suffix. Everything before the input is
+    byte-identical across calls, which lets providers cache it as a prompt
+    prefix.
+    """
+
+    __slots__ = ()
+
+    _template: str
+
+    @classmethod
+    @abstractmethod
+    def _fields(cls, **kwargs) -> Dict[str, Any]:
+        """Resolve the template fields other than the input text."""
+
+    @classmethod
+    def _split(cls, *args, **kwargs) -> Tuple[str, str]:
+        """Fill the template for these options and split it around the input."""
+        fields = cls._fields(*args, **kwargs)
+        fields["input_text"] = _INPUT_MARKER
+        prefix, suffix = (cls._template % fields).split(_INPUT_MARKER)
+        return prefix, suffix
+
+    def _bind(self, *args, **kwargs) -> Tuple[str, str]:
+        """
+        Return the prompt text before and after the input for these options.
+
+        Results are cached per class, so repeated options skip resolving and
+        filling the template, even across instances. Calls with unhashable
+        options (e.g. a list of focus areas) are bound directly.
+        """
+        try:
+            return _bound_template(type(self), *args, **kwargs)
+        except TypeError:
+            return self._split(*args, **kwargs)
+
+    def generate_prompts(self, input_texts: List[str], **kwargs) -> List[str]:
+        """
+        Generate prompts for several inputs that share the same options.
+
+        Args:
+            input_texts (List[str]): The input texts to process
+            **kwargs: Options accepted by generate_prompt
+
+        Returns:
+            List[str]: One generated prompt per input text
+        """
+        prefix, suffix = self._bind(**kwargs)
+        return [prefix + input_text + suffix for input_text in input_texts]
+
+
+class EmotionPrompting(_ZeroShotTechnique):
     """
     Emotion Prompting incorporates emotional cues to guide the model.
 
@@ -14,6 +86,26 @@ class EmotionPrompting(PromptTechnique):
     which can influence the tone, style, and framing of its response.
     """
 
+    __slots__ = ()
+
+    # Dedented once when the class is created and filled once per set of options.
+    # The task comes last so the instructions form a reusable prompt prefix.
+    _template = dedent_prompt("""
+        As an AI assistant, I want you to respond with %(intensity_phrase)s energy to the task below.
+
+        When responding:
+        - Express genuine %(emotion)s about this topic
+        - Use language that conveys %(emotion)s (tone, word choice, pacing)
+        - Maintain this emotional perspective throughout your response
+        - Still prioritize accuracy and helpfulness
+
+        %(context)s
+
+        Task: %(input_text)s
+
+        Begin your response now, showing your %(emotion)s perspective:
+        """)
+
     def __init__(self):
         """Initialize Emotion Prompting technique."""
         super().__init__(
@@ -38,29 +130,29 @@ class EmotionPrompting(PromptTechnique):
         Returns:
             str: Generated prompt with emotional cues
         """
-        context = kwargs.get("context", "")
-        intensity = kwargs.get("intensity", "")
+        prefix, suffix = self._bind(emotion, **kwargs)
+        return prefix + input_text + suffix
+
+    @classmethod
+    def _fields(
+        cls,
+        emotion: str = "excited",
+        *,
+        context: str = "",
+        intensity: str = "",
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Resolve the template fields other than the input text."""
         intensity_phrase = f"{intensity} {emotion}" if intensity else emotion
 
-        prompt = dedent_prompt(f"""
-        As an AI assistant, I want you to respond with {intensity_phrase} energy to this task.
-        
-        {context}
-        
-        Task: {input_text}
-        
-        When responding:
-        - Express genuine {emotion} about this topic
-        - Use language that conveys {emotion} (tone, word choice, pacing)
-        - Maintain this emotional perspective throughout your response
-        - Still prioritize accuracy and helpfulness
-        
-        Begin your response now, showing your {emotion} perspective:
-        """)
-        return prompt
+        return {
+            "intensity_phrase": intensity_phrase,
+            "emotion": emotion,
+            "context": context,
+        }
 
 
-class RolePrompting(PromptTechnique):
+class RolePrompting(_ZeroShotTechnique):
     """
     Role Prompting assigns a specific role to the model.
 
@@ -69,6 +161,25 @@ class RolePrompting(PromptTechnique):
     which can influence the perspective, depth, and style of its answer.
     """
 
+    __slots__ = ()
+
+    _template = dedent_prompt("""
+        I want you to assume the role of a %(experience_role)s in %(field)s. Think about the knowledge, perspective, and communication style that a real %(role)s would have.
+
+        When responding:
+        - Use terminology, concepts, and frameworks common in %(field)s
+        - Apply the analytical approach typical of a %(role)s
+        - Structure your response as a %(role)s would in a professional context
+        - Draw on specialized knowledge available to someone in this role
+        - Maintain this perspective throughout your entire response
+
+        %(audience_str)sGiven your expertise as a %(role)s, please address the following:
+
+        %(input_text)s
+
+        Your response as a %(role)s:
+        """)
+
     def __init__(self):
         """Initialize Role Prompting technique."""
         super().__init__(
@@ -92,33 +203,32 @@ class RolePrompting(PromptTechnique):
         Returns:
             str: Generated prompt with role assignment
         """
-        field = kwargs.get("field", "this field")
-        experience = kwargs.get("experience", "")
-        audience = kwargs.get("audience", "")
-
+        prefix, suffix = self._bind(role, **kwargs)
+        return prefix + input_text + suffix
+
+    @classmethod
+    def _fields(
+        cls,
+        role: str = "expert",
+        *,
+        field: str = "this field",
+        experience: str = "",
+        audience: str = "",
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Resolve the template fields other than the input text."""
         audience_str = f"Your target audience is {audience}. " if audience else ""
         experience_role = f"{experience} {role}" if experience else role
 
-        prompt = dedent_prompt(f"""
-        I want you to assume the role of a {experience_role} in {field}. Think about the knowledge, perspective, and communication style that a real {role} would have.
-        
-        {audience_str}Given your expertise as a {role}, please address the following:
-        
-        {input_text}
-        
-        When responding:
-        - Use terminology, concepts, and frameworks common in {field}
-        - Apply the analytical approach typical of a {role}
-        - Structure your response as a {role} would in a professional context
-        - Draw on specialized knowledge available to someone in this role
-        - Maintain this perspective throughout your entire response
-        
-        Your response as a {role}:
-        """)
-        return prompt
+        return {
+            "experience_role": experience_role,
+            "field": field,
+            "role": role,
+            "audience_str": audience_str,
+        }
 
 
-class StylePrompting(PromptTechnique):
+class StylePrompting(_ZeroShotTechnique):
     """
     Style Prompting guides the model to respond in a specific writing or communication style.
 
@@ -126,6 +236,22 @@ class StylePrompting(PromptTechnique):
     such as formal/informal tone, specific writing styles, or communication patterns.
     """
 
+    __slots__ = ()
+
+    _template = dedent_prompt("""
+        I want you to respond to the task below in a %(style)s style%(tone_str)s%(format_str)s%(audience_str)s.
+
+        Style Guidelines:
+        - Adopt the characteristic features of %(style)s writing
+        - Use appropriate vocabulary and sentence structure for this style
+        - Maintain consistency in your stylistic choices throughout
+        - Ensure the content remains accurate and helpful while following the style
+
+        Task: %(input_text)s
+
+        Respond now in the requested %(style)s style:
+        """)
+
     def __init__(self):
         """Initialize Style Prompting technique."""
         super().__init__(
@@ -151,31 +277,42 @@ class StylePrompting(PromptTechnique):
         Returns:
             str: Generated prompt with style guidance
         """
-        tone = kwargs.get("tone", "")
-        format_spec = kwargs.get("format", "")
-        audience = kwargs.get("audience", "")
+        prefix, suffix = self._bind(style, **kwargs)
+        return prefix + input_text + suffix
+
+    @classmethod
+    def _fields(
+        cls,
+        style: str = "professional",
+        *,
+        tone: str = "",
+        format: str = "",
+        audience: str = "",
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Resolve the template fields other than the input text."""
+        format_spec = format
 
         tone_str = f" with a {tone} tone" if tone else ""
         format_str = f" in {format_spec} format" if format_spec else ""
         audience_str = f" for {audience}" if audience else ""
 
-        prompt = dedent_prompt(f"""
-        I want you to respond to the following in a {style} style{tone_str}{format_str}{audience_str}.
-        
-        Task: {input_text}
-        
-        Style Guidelines:
-        - Adopt the characteristic features of {style} writing
-        - Use appropriate vocabulary and sentence structure for this style
-        - Maintain consistency in your stylistic choices throughout
-        - Ensure the content remains accurate and helpful while following the style
-        
-        Respond now in the requested {style} style:
-        """)
-        return prompt
+        return {
+            "style": style,
+            "tone_str": tone_str,
+            "format_str": format_str,
+            "audience_str": audience_str,
+        }
+
 
+_S2A_DEPTH_GUIDANCE = {
+    "basic": "Take time to consider the key aspects",
+    "detailed": "Carefully analyze multiple dimensions and implications",
+    "comprehensive": "Thoroughly examine all relevant factors, potential biases, and complex interactions",
+}
 
-class S2A(PromptTechnique):
+
+class S2A(_ZeroShotTechnique):
     """
     System 2 Attention (S2A) prompting technique.
 
@@ -183,6 +320,24 @@ class S2A(PromptTechnique):
     to engage its "System 2" thinking - slow, deliberate, and analytical processing.
     """
 
+    __slots__ = ()
+
+    _template = dedent_prompt("""
+        I want you to engage in slow, deliberate, and careful thinking about the task below. Avoid quick, automatic responses and instead:
+
+        1. Take a moment to understand what's being asked
+        2. Consider multiple perspectives and potential approaches
+        3. Identify any assumptions or biases that might affect your reasoning
+        4. Think through the implications of different aspects
+        5. Synthesize your careful analysis into a well-reasoned response
+
+        %(depth_guidance)s.
+
+        Task: %(input_text)s%(focus_str)s
+
+        Now, engage your deliberate, analytical thinking to respond:
+        """)
+
     def __init__(self):
         """Initialize S2A technique."""
         super().__init__(
@@ -204,38 +359,45 @@ class S2A(PromptTechnique):
         Returns:
             str: Generated S2A prompt
         """
-        focus_areas = kwargs.get("focus_areas", [])
-        analysis_depth = kwargs.get("analysis_depth", "detailed")
-
+        prefix, suffix = self._bind(**kwargs)
+        return prefix + input_text + suffix
+
+    @classmethod
+    def _fields(
+        cls,
+        *,
+        focus_areas: Optional[List[str]] = None,
+        analysis_depth: str = "detailed",
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Resolve the template fields other than the input text."""
         focus_str = ""
         if focus_areas:
             focus_str = f"\nPay particular attention to: {', '.join(focus_areas)}"
 
-        depth_guidance = {
-            "basic": "Take time to consider the key aspects",
-            "detailed": "Carefully analyze multiple dimensions and implications",
-            "comprehensive": "Thoroughly examine all relevant factors, potential biases, and complex interactions",
-        }.get(analysis_depth, "Carefully analyze multiple dimensions and implications")
-
-        prompt = dedent_prompt(f"""
-        I want you to engage in slow, deliberate, and careful thinking about this task. 
-        
-        {depth_guidance}. Avoid quick, automatic responses and instead:
-        
-        1. Take a moment to understand what's being asked
-        2. Consider multiple perspectives and potential approaches
-        3. Identify any assumptions or biases that might affect your reasoning
-        4. Think through the implications of different aspects
-        5. Synthesize your careful analysis into a well-reasoned response
-        
-        Task: {input_text}{focus_str}
-        
-        Now, engage your deliberate, analytical thinking to respond:
-        """)
-        return prompt
+        depth_guidance = _S2A_DEPTH_GUIDANCE.get(
+            analysis_depth, _S2A_DEPTH_GUIDANCE["detailed"]
+        )
+
+        return {
+            "depth_guidance": depth_guidance,
+            "focus_str": focus_str,
+        }
+
+
+# Default perspectives for SimToM, joined once at import time
+_SIMTOM_DEFAULT_PERSPECTIVES = ", ".join(
+    ("different stakeholders", "various viewpoints")
+)
 
+_SIMTOM_DEPTH_GUIDANCE = {
+    "basic": "consider what others might think or feel",
+    "moderate": "deeply consider the mental states, motivations, and perspectives of others",
+    "advanced": "comprehensively simulate the complex mental models, emotional states, and reasoning patterns of different individuals",
+}
 
-class SimToM(PromptTechnique):
+
+class SimToM(_ZeroShotTechnique):
     """
     Simulation Theory of Mind (SimToM) prompting technique.
 
@@ -243,6 +405,25 @@ class SimToM(PromptTechnique):
     to better understand and respond to tasks involving human behavior, motivations, or social dynamics.
     """
 
+    __slots__ = ()
+
+    _template = dedent_prompt("""
+        Before responding to the task below, mentally simulate:
+        1. What different people might be thinking and feeling
+        2. What motivations and goals various parties might have
+        3. How different perspectives might interpret this situation
+        4. What concerns, hopes, or expectations others might hold
+        5. How social and emotional factors might influence the situation
+
+        For this task, I want you to %(depth_guidance)s involved in or affected by this situation.
+
+        Consider perspectives from: %(perspectives_str)s
+
+        Task: %(input_text)s%(context_str)s
+
+        Now, using your simulation of these different mental states and perspectives, provide a thoughtful response:
+        """)
+
     def __init__(self):
         """Initialize SimToM technique."""
         super().__init__(
@@ -265,44 +446,44 @@ class SimToM(PromptTechnique):
         Returns:
             str: Generated SimToM prompt
         """
-        perspectives = kwargs.get(
-            "perspectives", ["different stakeholders", "various viewpoints"]
-        )
-        context = kwargs.get("context", "")
-        depth = kwargs.get("depth", "moderate")
-
+        prefix, suffix = self._bind(**kwargs)
+        return prefix + input_text + suffix
+
+    @classmethod
+    def _fields(
+        cls,
+        *,
+        perspectives: Optional[List[str]] = None,
+        context: str = "",
+        depth: str = "moderate",
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Resolve the template fields other than the input text."""
         context_str = f"\nContext: {context}" if context else ""
-        perspectives_str = ", ".join(perspectives)
-
-        depth_guidance = {
-            "basic": "consider what others might think or feel",
-            "moderate": "deeply consider the mental states, motivations, and perspectives of others",
-            "advanced": "comprehensively simulate the complex mental models, emotional states, and reasoning patterns of different individuals",
-        }.get(
-            depth,
-            "deeply consider the mental states, motivations, and perspectives of others",
+        if perspectives is None:
+            perspectives_str = _SIMTOM_DEFAULT_PERSPECTIVES
+        else:
+            perspectives_str = ", ".join(perspectives)
+
+        depth_guidance = _SIMTOM_DEPTH_GUIDANCE.get(
+            depth, _SIMTOM_DEPTH_GUIDANCE["moderate"]
         )
 
-        prompt = dedent_prompt(f"""
-        For this task, I want you to {depth_guidance} involved in or affected by this situation.
-        
-        Task: {input_text}{context_str}
-        
-        Before responding, mentally simulate:
-        1. What different people might be thinking and feeling
-        2. What motivations and goals various parties might have
-        3. How different perspectives might interpret this situation
-        4. What concerns, hopes, or expectations others might hold
-        5. How social and emotional factors might influence the situation
-        
-        Consider perspectives from: {perspectives_str}
-        
-        Now, using your simulation of these different mental states and perspectives, provide a thoughtful response:
-        """)
-        return prompt
+        return {
+            "depth_guidance": depth_guidance,
+            "context_str": context_str,
+            "perspectives_str": perspectives_str,
+        }
+
+
+_RAR_FOCUS_GUIDANCE = {
+    "key_points": "the main points and essential elements",
+    "implications": "the underlying implications and what's being asked",
+    "requirements": "the specific requirements and expected outcomes",
+}
 
 
-class RaR(PromptTechnique):
+class RaR(_ZeroShotTechnique):
     """
     Rephrase and Respond (RaR) prompting technique.
 
@@ -310,6 +491,22 @@ class RaR(PromptTechnique):
     to ensure understanding, then provide a response based on the rephrased version.
     """
 
+    __slots__ = ()
+
+    _template = dedent_prompt("""
+        I want you to first rephrase the input below in your own words to demonstrate your understanding, then provide your response.
+
+        Step 1 - Rephrase:
+        Please rephrase this input, focusing on %(focus_guidance)s:%(clarify_str)s
+
+        Step 2 - Respond:
+        Based on your rephrased understanding, provide a comprehensive response.
+
+        Original Input: %(input_text)s
+
+        Step 1 - Rephrase:
+        """)
+
     def __init__(self):
         """Initialize RaR technique."""
         super().__init__(
@@ -331,14 +528,21 @@ class RaR(PromptTechnique):
         Returns:
             str: Generated RaR prompt
         """
-        rephrase_focus = kwargs.get("rephrase_focus", "key_points")
-        clarify_ambiguity = kwargs.get("clarify_ambiguity", True)
-
-        focus_guidance = {
-            "key_points": "the main points and essential elements",
-            "implications": "the underlying implications and what's being asked",
-            "requirements": "the specific requirements and expected outcomes",
-        }.get(rephrase_focus, "the main points and essential elements")
+        prefix, suffix = self._bind(**kwargs)
+        return prefix + input_text + suffix
+
+    @classmethod
+    def _fields(
+        cls,
+        *,
+        rephrase_focus: str = "key_points",
+        clarify_ambiguity: bool = True,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Resolve the template fields other than the input text."""
+        focus_guidance = _RAR_FOCUS_GUIDANCE.get(
+            rephrase_focus, _RAR_FOCUS_GUIDANCE["key_points"]
+        )
 
         clarify_str = (
             "\n- Address any ambiguities or unclear aspects"
@@ -346,21 +550,31 @@ class RaR(PromptTechnique):
             else ""
         )
 
-        prompt = dedent_prompt(f"""
-        I want you to first rephrase the following input in your own words to demonstrate your understanding, then provide your response.
-        
-        Original Input: {input_text}
-        
-        Step 1 - Rephrase: 
-        Please rephrase this input, focusing on {focus_guidance}:{clarify_str}
-        
-        Step 2 - Respond:
-        Based on your rephrased understanding, provide a comprehensive response:
-        """)
-        return prompt
+        return {
+            "focus_guidance": focus_guidance,
+            "clarify_str": clarify_str,
+        }
+
+
+_RF2_REASONING_GUIDANCE = {
+    "step-by-step": "work through this step-by-step",
+    "analytical": "break down and analyze the components",
+    "comparative": "compare different aspects and alternatives",
+    "systematic": "approach this systematically and methodically",
+}
+
+
+# Instructions inserted into the RF2 template depending on show_reasoning
+_RF2_SHOW_REASONING = (
+    "\n\nStep 1 - Reasoning Phase:\n"
+    "First, work through your thinking process. Don't worry about formatting yet - just focus on the logic and reasoning.\n\n"
+    "Step 2 - Formatting Phase:\n"
+    "Now, present your reasoning and conclusions in a clear, well-organized format."
+)
+_RF2_HIDE_REASONING = "\n\nFirst, work through your reasoning internally, then present your final response in a clear, well-organized format."
 
 
-class RF2(PromptTechnique):
+class RF2(_ZeroShotTechnique):
     """
     Reason First, Format Second (RF2) prompting technique.
 
@@ -368,6 +582,18 @@ class RF2(PromptTechnique):
     encouraging the model to first work through the logic and then present it clearly.
     """
 
+    __slots__ = ()
+
+    _template = dedent_prompt("""
+        I want you to %(reasoning_guidance)s, but separate your reasoning process from your final formatting.%(show_reasoning_str)s
+
+        Target format for final response: %(output_format)s
+
+        Task: %(input_text)s
+
+        Begin your reasoning process:
+        """)
+
     def __init__(self):
         """Initialize RF2 technique."""
         super().__init__(
@@ -390,46 +616,50 @@ class RF2(PromptTechnique):
         Returns:
             str: Generated RF2 prompt
         """
-        reasoning_style = kwargs.get("reasoning_style", "step-by-step")
-        output_format = kwargs.get("output_format", "clear and organized")
-        show_reasoning = kwargs.get("show_reasoning", True)
-
-        reasoning_guidance = {
-            "step-by-step": "work through this step-by-step",
-            "analytical": "break down and analyze the components",
-            "comparative": "compare different aspects and alternatives",
-            "systematic": "approach this systematically and methodically",
-        }.get(reasoning_style, "work through this step-by-step")
+        prefix, suffix = self._bind(**kwargs)
+        return prefix + input_text + suffix
+
+    @classmethod
+    def _fields(
+        cls,
+        *,
+        reasoning_style: str = "step-by-step",
+        output_format: str = "clear and organized",
+        show_reasoning: bool = True,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Resolve the template fields other than the input text."""
+        reasoning_guidance = _RF2_REASONING_GUIDANCE.get(
+            reasoning_style, _RF2_REASONING_GUIDANCE["step-by-step"]
+        )
 
         show_reasoning_str = (
-            """
-        
-        Step 1 - Reasoning Phase:
-        First, work through your thinking process. Don't worry about formatting yet - just focus on the logic and reasoning.
-        
-        Step 2 - Formatting Phase:
-        Now, present your reasoning and conclusions in a clear, well-organized format.
-        """
-            if show_reasoning
-            else """
-        
-        First, work through your reasoning internally, then present your final response in a clear, well-organized format.
-        """
+            _RF2_SHOW_REASONING if show_reasoning else _RF2_HIDE_REASONING
         )
 
-        prompt = dedent_prompt(f"""
-        Task: {input_text}
-        
-        I want you to {reasoning_guidance}, but separate your reasoning process from your final formatting.{show_reasoning_str}
-        
-        Target format for final response: {output_format}
-        
-        Begin your reasoning process:
-        """)
-        return prompt
+        return {
+            "reasoning_guidance": reasoning_guidance,
+            "show_reasoning_str": show_reasoning_str,
+            "output_format": output_format,
+        }
+
+
+_SELF_ASK_DEPTH_GUIDANCE = {
+    "shallow": "focus on basic clarifications and direct implications",
+    "moderate": "explore key factors, important connections, and significant implications",
+    "deep": "delve into underlying principles, complex interconnections, and explore nuanced aspects",
+}
+
 
+@functools.lru_cache(maxsize=32)
+def _self_ask_questions(num_questions: int, domain: str) -> str:
+    """Build the numbered question/answer scaffold for one SelfAsk option combination."""
+    domain_str = f" in the domain of {domain}" if domain else ""
+    question = f". [Ask a specific, focused question that helps address an important aspect of the main question{domain_str}]\n[Provide a clear, evidence-based answer to this question]"
+    return "\n\n".join([f"{i}{question}" for i in range(1, num_questions + 1)])
 
-class SelfAsk(PromptTechnique):
+
+class SelfAsk(_ZeroShotTechnique):
     """
     Self-Ask encourages the model to ask and answer its own questions.
 
@@ -439,6 +669,22 @@ class SelfAsk(PromptTechnique):
     This can lead to more thorough analysis and reasoning.
     """
 
+    __slots__ = ()
+
+    # The questions block is substituted whole, so its lines never affect dedenting.
+    # The questions scaffold follows the main question it answers.
+    _template = dedent_prompt("""
+        To thoroughly answer the main question below, I'll use a self-questioning approach. I'll identify and answer %(num_questions)s key follow-up questions that will help me build toward a comprehensive response. For each question, I'll %(depth_guidance)s.
+
+        Main Question: %(input_text)s
+
+        %(questions)s
+
+        Now, synthesizing all the information from my self-questioning process:
+
+        Final comprehensive answer to the original question:
+        """)
+
     def __init__(self):
         """Initialize Self-Ask technique."""
         super().__init__(
@@ -461,37 +707,27 @@ class SelfAsk(PromptTechnique):
         Returns:
             str: Generated self-ask prompt
         """
-        num_questions = kwargs.get("num_questions", 3)
-        depth = kwargs.get("depth", "moderate")
-        domain = kwargs.get("domain", "")
-
-        domain_str = f" in the domain of {domain}" if domain else ""
-
-        depth_guidance = {
-            "shallow": "focus on basic clarifications and direct implications",
-            "moderate": "explore key factors, important connections, and significant implications",
-            "deep": "delve into underlying principles, complex interconnections, and explore nuanced aspects",
-        }.get(
-            depth,
-            "explore key factors, important connections, and significant implications",
+        prefix, suffix = self._bind(**kwargs)
+        return prefix + input_text + suffix
+
+    @classmethod
+    def _fields(
+        cls,
+        *,
+        num_questions: int = 3,
+        depth: str = "moderate",
+        domain: str = "",
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Resolve the template fields other than the input text."""
+        depth_guidance = _SELF_ASK_DEPTH_GUIDANCE.get(
+            depth, _SELF_ASK_DEPTH_GUIDANCE["moderate"]
         )
 
-        questions = "\n\n".join(
-            [
-                f"{i + 1}. [Ask a specific, focused question that helps address an important aspect of the main question{domain_str}]\n[Provide a clear, evidence-based answer to this question]"
-                for i in range(num_questions)
-            ]
-        )
-
-        prompt = dedent_prompt(f"""
-        Main Question: {input_text}
-        
-        To thoroughly answer this question, I'll use a self-questioning approach. I'll identify and answer {num_questions} key follow-up questions that will help me build toward a comprehensive response. For each question, I'll {depth_guidance}.
+        questions = _self_ask_questions(num_questions, domain)
 
-        {questions}
-        
-        Now, synthesizing all the information from my self-questioning process:
-        
-        Final comprehensive answer to the original question:
-        """)
-        return prompt
+        return {
+            "num_questions": num_questions,
+            "depth_guidance": depth_guidance,
+            "questions": questions,
+        }
@@ -18,15 +18,18 @@ import subprocess
 from datetime import datetime
 from pathlib import Path
 
+# Anchored so only the module-level assignment matches, as in setup.py
+_VERSION_RE = re.compile(r'^__version__\s*=\s*["\']([^"\']+)["\']', re.MULTILINE)
+_SECTION_RE = re.compile(r"^## \[", re.MULTILINE)
+
 
 def get_current_version():
-    """Get current version from __init__.py."""
-    init_file = Path("proctor/__init__.py")
-    content = init_file.read_text()
-    match = re.search(r'__version__\s*=\s*["\']([^"\']+)["\']', content)
+    """Get current version and the contents of __init__.py."""
+    content = Path("proctor/__init__.py").read_text()
+    match = _VERSION_RE.search(content)
     if not match:
         raise ValueError("Could not find version in __init__.py")
-    return match.group(1)
+    return match.group(1), content
 
 
 def bump_version(current_version, bump_type):
@@ -43,16 +46,10 @@ def bump_version(current_version, bump_type):
         raise ValueError(f"Invalid bump type: {bump_type}")
 
 
-def update_version_in_file(new_version):
-    """Update the version in __init__.py."""
-    init_file = Path("proctor/__init__.py")
-    content = init_file.read_text()
-    updated_content = re.sub(
-        r'__version__\s*=\s*["\']([^"\']+)["\']',
-        f'__version__ = "{new_version}"',
-        content
-    )
-    init_file.write_text(updated_content)
+def update_version_in_file(new_version, content):
+    """Update the version in __init__.py, given its current contents."""
+    updated_content = _VERSION_RE.sub(f'__version__ = "{new_version}"', content, count=1)
+    Path("proctor/__init__.py").write_text(updated_content)
     print(f"Updated version in __init__.py to {new_version}")
 
 
@@ -72,26 +69,22 @@ def update_changelog(new_version):
     today = datetime.now().strftime("%Y-%m-%d")
     new_version_section = f"## [{new_version}] - {today}\n\n### Added\n\n- \n\n### Changed\n\n- \n\n### Fixed\n\n- \n\n"
     
-    # Find the position to insert (after the header)
-    lines = changelog_content.split("\n")
-    insert_pos = 0
-    for i, line in enumerate(lines):
-        if line.startswith("## ["):
-            insert_pos = i
-            break
-        elif i > 10:  # Look only in the first few lines
-            break
-    
-    if insert_pos == 0:
-        # Insert after the header
-        for i, line in enumerate(lines):
-            if line.startswith("# Changelog"):
-                insert_pos = i + 2  # Skip an empty line
-                break
-    
-    # Insert the new version section
-    lines.insert(insert_pos, new_version_section)
-    updated_content = "\n".join(lines)
+    # Insert before the latest release, or after the header if there is none
+    match = _SECTION_RE.search(changelog_content)
+    if match:
+        insert_at = match.start()
+    else:
+        insert_at = 0
+        header = changelog_content.find("# Changelog")
+        if header != -1:
+            blank = changelog_content.find("\n\n", header)
+            insert_at = len(changelog_content) if blank == -1 else blank + 2
+    
+    updated_content = (
+        changelog_content[:insert_at]
+        + new_version_section
+        + changelog_content[insert_at:]
+    )
     
     # Write back to file
     changelog_path.write_text(updated_content)
@@ -100,10 +93,10 @@ def update_changelog(new_version):
 
 
 def run_command(command):
-    """Run a shell command and return its output."""
-    result = subprocess.run(command, shell=True, capture_output=True, text=True)
+    """Run a command given as an argument list and return its output."""
+    result = subprocess.run(command, capture_output=True, text=True)
     if result.returncode != 0:
-        print(f"Error running command: {command}")
+        print(f"Error running command: {' '.join(command)}")
         print(f"Error: {result.stderr}")
         sys.exit(1)
     return result.stdout.strip()
@@ -112,17 +105,17 @@ def run_command(command):
 def git_commit_and_tag(version):
     """Commit the version changes and create a new tag."""
     # Check if there are changes to commit
-    status = run_command("git status --porcelain")
+    status = run_command(["git", "status", "--porcelain"])
     if not status:
         print("No changes to commit.")
         return
     
     # Commit the changes
-    run_command(f'git commit -a -m "chore: bump version to {version}"')
+    run_command(["git", "commit", "-a", "-m", f"chore: bump version to {version}"])
     print(f"Committed changes for version {version}")
     
     # Create a new tag
-    run_command(f'git tag -a v{version} -m "Version {version}"')
+    run_command(["git", "tag", "-a", f"v{version}", "-m", f"Version {version}"])
     print(f"Created tag v{version}")
 
 
@@ -133,7 +126,7 @@ def main():
         sys.exit(1)
     
     bump_type = sys.argv[1]
-    current_version = get_current_version()
+    current_version, init_content = get_current_version()
     new_version = bump_version(current_version, bump_type)
     
     print(f"Current version: {current_version}")
@@ -146,7 +139,7 @@ def main():
         sys.exit(0)
     
     # Update version and changelog
-    update_version_in_file(new_version)
+    update_version_in_file(new_version, init_content)
     update_changelog(new_version)
     
     # Let the user edit the changelog
@@ -158,13 +151,13 @@ def main():
     # Push changes and tag
     push_confirmation = input("Do you want to push the changes and tag? [y/N] ")
     if push_confirmation.lower() == "y":
-        run_command("git push")
-        run_command("git push --tags")
+        # The release tag is annotated, so --follow-tags pushes it with the commit
+        run_command(["git", "push", "--atomic", "--follow-tags"])
         print("Pushed changes and tags to remote repository.")
         print(f"Release v{new_version} is now ready!")
     else:
         print("Changes and tags were not pushed. You can push them later with:")
-        print("  git push && git push --tags")
+        print("  git push --atomic --follow-tags")
 
 
 if __name__ == "__main__":
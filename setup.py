@@ -1,21 +1,40 @@
 """
 Setup script for the proctor package.
 """
+import os
+import re
+
 from setuptools import setup, find_packages
 
 # Read version from package
-about = {}
+_VERSION_RE = re.compile(r'^__version__\s*=\s*["\']([^"\']+)["\']', re.MULTILINE)
 with open("proctor/__init__.py") as f:
-    exec(next(filter(lambda line: line.startswith("__version__"), f)), about)
+    version = _VERSION_RE.search(f.read()).group(1)
+
+# Optional ahead-of-time compilation of the pure-Python prompt builders.
+# Enable with PROCTOR_USE_MYPYC=1 (requires `pip install mypy`).
+ext_modules = []
+if os.environ.get("PROCTOR_USE_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(
+        [
+            "--follow-imports=silent",
+            "proctor/base.py",
+            "proctor/thought_generation/techniques.py",
+        ],
+        opt_level="3",
+    )
 
 setup(
     name="proctor",
-    version=about["__version__"],
+    version=version,
     description="A comprehensive package for text-based prompting techniques",
     author="Your Name",
     author_email="your.email@example.com",
     url="https://github.com/svngoku/proctor",
     packages=find_packages(exclude=["tests", "examples"]),
+    ext_modules=ext_modules,
     install_requires=[
         "litellm>=1.0.0",
         "openai>=1.0.0",
@@ -27,6 +46,10 @@ setup(
             "sentence-transformers>=2.0.0",
             "scikit-learn>=1.0.0",
         ],
+        "cache": [
+            "diskcache>=5.0.0",
+            "redis>=4.0.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
@@ -36,6 +59,8 @@ setup(
         "all": [
             "sentence-transformers>=2.0.0",
             "scikit-learn>=1.0.0",
+            "diskcache>=5.0.0",
+            "redis>=4.0.0",
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
             "ruff>=0.0.270",
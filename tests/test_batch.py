@@ -0,0 +1,187 @@
+"""
+Unit tests for provider batch processing.
+"""
+
+import json
+import unittest
+from unittest.mock import patch, MagicMock
+
+from proctor.batch import BatchProcessor
+from proctor.utils import LLMError
+
+
+def _output_line(custom_id, content=None, error=None):
+    """Build one line of a batch output file."""
+    if error is not None:
+        response = {"status_code": 400, "body": {"error": error}}
+    else:
+        response = {
+            "status_code": 200,
+            "body": {"choices": [{"message": {"content": content}}]},
+        }
+    return json.dumps({"custom_id": custom_id, "response": response, "error": None})
+
+
+class TestBatchProcessor(unittest.TestCase):
+    """Test cases for BatchProcessor."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        patcher = patch("proctor.batch.get_llm_config")
+        self.mock_get_config = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_get_config.return_value = {
+            "model": "openai/test-model",
+            "api_base": "https://api.test.com",
+            "api_key": "",
+        }
+
+    @patch("proctor.batch.time.sleep")
+    @patch("litellm.file_content")
+    @patch("litellm.retrieve_batch")
+    @patch("litellm.create_batch")
+    @patch("litellm.create_file")
+    def test_run_batch_api(
+        self,
+        mock_create_file,
+        mock_create_batch,
+        mock_retrieve_batch,
+        mock_file_content,
+        mock_sleep,
+    ):
+        """Test that prompts are submitted, polled and returned in order."""
+        mock_create_file.return_value = MagicMock(id="file-1")
+        mock_create_batch.return_value = MagicMock(id="batch-1")
+        mock_retrieve_batch.side_effect = [
+            MagicMock(status="in_progress"),
+            MagicMock(status="completed", output_file_id="file-2"),
+        ]
+        # Results may come back in any order
+        mock_file_content.return_value = MagicMock(
+            content="\n".join(
+                [_output_line("1", "Second"), _output_line("0", "First")]
+            ).encode()
+        )
+
+        processor = BatchProcessor(poll_interval=5)
+        results = processor.run(["One", "Two"], system_prompt="Be brief.")
+
+        self.assertEqual(results, ["First", "Second"])
+        mock_sleep.assert_called_once_with(5)
+
+        _, payload = mock_create_file.call_args.kwargs["file"]
+        requests = [json.loads(line) for line in payload.decode().splitlines()]
+        self.assertEqual([r["custom_id"] for r in requests], ["0", "1"])
+        self.assertEqual(requests[0]["body"]["model"], "test-model")
+        self.assertEqual(
+            requests[1]["body"]["messages"][-1], {"role": "user", "content": "Two"}
+        )
+
+    @patch("litellm.create_batch")
+    @patch("litellm.create_file")
+    def test_run_batch_api_model_and_messages(
+        self, mock_create_file, mock_create_batch
+    ):
+        """Test the model route check and plain system messages."""
+        processor = BatchProcessor()
+        with self.assertRaises(ValueError):
+            processor.run(["One"], config_override={"model": "anthropic/claude"})
+        mock_create_file.assert_not_called()
+
+        # Stop after the upload; only the request file is inspected
+        mock_create_batch.side_effect = RuntimeError("stop")
+        with self.assertRaises(LLMError):
+            processor.run(
+                ["One"],
+                system_prompt="Be brief.",
+                config_override={"cache_system_prompt": True},
+            )
+
+        _, payload = mock_create_file.call_args.kwargs["file"]
+        messages = json.loads(payload)["body"]["messages"]
+        self.assertEqual(messages[0], {"role": "system", "content": "Be brief."})
+
+    @patch("litellm.file_content")
+    @patch("litellm.retrieve_batch")
+    @patch("litellm.create_batch")
+    @patch("litellm.create_file")
+    def test_run_batch_api_errors(
+        self,
+        mock_create_file,
+        mock_create_batch,
+        mock_retrieve_batch,
+        mock_file_content,
+    ):
+        """Test failed requests and failed batches."""
+        mock_create_batch.return_value = MagicMock(id="batch-1")
+        mock_retrieve_batch.return_value = MagicMock(
+            status="completed", output_file_id="file-2"
+        )
+        mock_file_content.return_value = MagicMock(
+            content=_output_line("0", error="bad request").encode()
+        )
+
+        processor = BatchProcessor()
+        results = processor.run(["One", "Two"], return_exceptions=True)
+        self.assertIsInstance(results[0], LLMError)
+        self.assertIsInstance(results[1], LLMError)
+        with self.assertRaises(LLMError):
+            processor.run(["One"])
+
+        mock_retrieve_batch.return_value = MagicMock(status="failed")
+        with self.assertRaises(LLMError):
+            processor.run(["One"])
+
+    @patch("proctor.batch.time.monotonic")
+    @patch("proctor.batch.time.sleep")
+    @patch("litellm.retrieve_batch")
+    @patch("litellm.create_batch")
+    @patch("litellm.create_file")
+    def test_run_batch_api_timeout(
+        self,
+        mock_create_file,
+        mock_create_batch,
+        mock_retrieve_batch,
+        mock_sleep,
+        mock_monotonic,
+    ):
+        """Test that polling gives up once the timeout has passed."""
+        # A fake clock that advances only while sleeping
+        clock = [0.0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        mock_monotonic.side_effect = lambda: clock[0]
+        mock_sleep.side_effect = sleep
+        mock_create_batch.return_value = MagicMock(id="batch-1")
+        mock_retrieve_batch.return_value = MagicMock(status="in_progress")
+
+        processor = BatchProcessor(poll_interval=4, timeout=10)
+        with self.assertRaises(LLMError) as context:
+            processor.run(["One"])
+
+        self.assertIn("did not finish within 10s", str(context.exception))
+        # The last wait is cut short so the deadline is not overshot
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [4, 4, 2])
+
+    def test_unsupported_provider(self):
+        """Test that providers without an OpenAI-format batch API are rejected."""
+        with self.assertRaises(ValueError) as context:
+            BatchProcessor(provider="anthropic")
+        self.assertIn("Unsupported batch provider 'anthropic'", str(context.exception))
+
+    @patch("proctor.batch.call_llm_batch")
+    def test_run_without_batch_api(self, mock_call_llm_batch):
+        """Test that the interactive fallback uses call_llm_batch."""
+        mock_call_llm_batch.return_value = ["First"]
+
+        processor = BatchProcessor(use_batch_api=False, concurrency=4)
+        self.assertEqual(processor.run(["One"]), ["First"])
+        mock_call_llm_batch.assert_called_once_with(
+            ["One"], None, None, concurrency=4, return_exceptions=False
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Unit tests for prompt dedenting helpers.
+
+Kept apart from test_utils so they run without importing litellm.
+"""
+
+import unittest
+
+from proctor.utils import dedent_prompt, dedent_method_prompt
+
+
+class TestDedent(unittest.TestCase):
+    """Test cases for dedent_prompt and dedent_method_prompt."""
+
+    def test_dedent_prompt(self):
+        """Test dedent_prompt function."""
+        # Test with indented multi-line string
+        indented = """
+            This is a test prompt
+            with multiple lines
+                and varying indentation
+            levels.
+        """
+
+        expected = "This is a test prompt\nwith multiple lines\n    and varying indentation\nlevels."
+        result = dedent_prompt(indented)
+        self.assertEqual(result, expected)
+
+        # Test with single line
+        single_line = "Single line prompt"
+        self.assertEqual(dedent_prompt(single_line), single_line)
+
+        # Test with empty string
+        self.assertEqual(dedent_prompt(""), "")
+
+    def test_dedent_method_prompt(self):
+        """Test dedent_method_prompt with an interpolated multi-line value."""
+        items = "- first\n- second"
+        prompt = f"""
+        Items:
+        {items}
+            Indented detail
+        """
+
+        expected = "Items:\n- first\n- second\n    Indented detail"
+        self.assertEqual(dedent_method_prompt(prompt), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,18 +9,25 @@ import numpy as np
 
 # The module uses try/except for imports, so we need to mock them
 @patch("proctor.few_shot.knn_implementation._DEPS_AVAILABLE", True)
-@patch("proctor.few_shot.knn_implementation.SentenceTransformer")
+@patch("proctor.embeddings.SentenceTransformer")
 @patch("proctor.few_shot.knn_implementation.cosine_similarity")
 class TestSemanticKNN(unittest.TestCase):
     """Test cases for the SemanticKNN implementation."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Import the module under test once for all tests."""
+        from proctor import embeddings
+        from proctor.few_shot import knn_implementation
+
+        cls.embeddings = embeddings
+        cls.SemanticKNN = knn_implementation.SemanticKNN
+        cls.EmbeddingCache = knn_implementation.EmbeddingCache
+
     def setUp(self):
         """Set up test fixtures."""
-        # Import here after mocking
-        from proctor.few_shot.knn_implementation import SemanticKNN, EmbeddingCache
-
-        self.SemanticKNN = SemanticKNN
-        self.EmbeddingCache = EmbeddingCache
+        # Each test patches its own SentenceTransformer mock
+        self.embeddings._MODELS.clear()
 
     def test_embedding_cache_init(self, mock_cos_sim, mock_transformer):
         """Test EmbeddingCache initialization."""
@@ -41,8 +48,8 @@ class TestSemanticKNN(unittest.TestCase):
         cache.add("text2", embedding2)
 
         # Retrieve from cache
-        self.assertTrue(np.array_equal(cache.get("text1"), embedding1))
-        self.assertTrue(np.array_equal(cache.get("text2"), embedding2))
+        np.testing.assert_allclose(cache.get("text1"), embedding1)
+        np.testing.assert_allclose(cache.get("text2"), embedding2)
         self.assertIsNone(cache.get("nonexistent"))
 
     def test_embedding_cache_max_size(self, mock_cos_sim, mock_transformer):
@@ -61,8 +68,34 @@ class TestSemanticKNN(unittest.TestCase):
 
         # Check that text1 was removed and text2, text3 remain
         self.assertIsNone(cache.get("text1"))
-        self.assertTrue(np.array_equal(cache.get("text2"), embedding2))
-        self.assertTrue(np.array_equal(cache.get("text3"), embedding3))
+        np.testing.assert_allclose(cache.get("text2"), embedding2)
+        np.testing.assert_allclose(cache.get("text3"), embedding3)
+
+    def test_embedding_cache_lru_order(self, mock_cos_sim, mock_transformer):
+        """Test that reading an entry protects it from eviction."""
+        cache = self.EmbeddingCache(max_size=2)
+
+        cache.add("text1", np.array([0.1, 0.2, 0.3]))
+        cache.add("text2", np.array([0.4, 0.5, 0.6]))
+        cache.get("text1")  # text2 is now the least recently used
+        cache.add("text3", np.array([0.7, 0.8, 0.9]))
+
+        self.assertIsNone(cache.get("text2"))
+        self.assertIsNotNone(cache.get("text1"))
+        self.assertIsNotNone(cache.get("text3"))
+
+    def test_embedding_cache_get_survives_eviction(
+        self, mock_cos_sim, mock_transformer
+    ):
+        """Test that a returned embedding is not changed by a later eviction."""
+        cache = self.EmbeddingCache(max_size=1)
+        cache.add("text1", np.array([0.1, 0.2, 0.3]))
+
+        embedding = cache.get("text1")
+        cache.add("text2", np.array([0.7, 0.8, 0.9]))  # Reuses text1's row
+
+        self.assertIsNone(cache.get("text1"))
+        np.testing.assert_allclose(embedding, [0.1, 0.2, 0.3], rtol=1e-6)
 
     def test_semantic_knn_init(self, mock_cos_sim, mock_transformer):
         """Test SemanticKNN initialization."""
@@ -74,6 +107,18 @@ class TestSemanticKNN(unittest.TestCase):
         # Check that cache was initialized
         self.assertEqual(knn.cache.max_size, 100)
 
+    def test_semantic_knn_model_cached(self, mock_cos_sim, mock_transformer):
+        """Test that the model is loaded once per model name."""
+        knn1 = self.SemanticKNN(model_name="test-model")
+        knn2 = self.SemanticKNN(model_name="test-model")
+
+        mock_transformer.assert_called_once_with("test-model")
+        self.assertIs(knn1.model, knn2.model)
+
+        # A different model name loads a new model
+        self.SemanticKNN(model_name="other-model")
+        self.assertEqual(mock_transformer.call_count, 2)
+
     def test_get_embedding_new(self, mock_cos_sim, mock_transformer):
         """Test getting a new embedding (not in cache)."""
         # Set up the mock model
@@ -88,10 +133,10 @@ class TestSemanticKNN(unittest.TestCase):
         mock_model.encode.assert_called_once_with("test text", convert_to_numpy=True)
 
         # Check that result is correct
-        self.assertTrue(np.array_equal(result, mock_embedding))
+        self.assertIs(result, mock_embedding)
 
         # Check that embedding was added to cache
-        self.assertTrue(np.array_equal(knn.cache.get("test text"), mock_embedding))
+        np.testing.assert_allclose(knn.cache.get("test text"), mock_embedding)
 
     def test_get_embedding_cached(self, mock_cos_sim, mock_transformer):
         """Test getting an embedding from cache."""
@@ -111,7 +156,7 @@ class TestSemanticKNN(unittest.TestCase):
         mock_model.encode.assert_not_called()
 
         # Check that result is correct (from cache)
-        self.assertTrue(np.array_equal(result, mock_embedding))
+        np.testing.assert_allclose(result, mock_embedding)
 
     def test_find_nearest(self, mock_cos_sim, mock_transformer):
         """Test finding nearest neighbors."""
@@ -125,14 +170,12 @@ class TestSemanticKNN(unittest.TestCase):
             ]
         )
 
-        # Mock the encode method to return different embeddings for different inputs
+        # Mock the encode method: the query alone, then the candidates as a batch
         def mock_encode(text, convert_to_numpy):
             if text == "query":
                 return query_embedding
-            elif text == "candidate1":
-                return candidate_embeddings[0]
-            elif text == "candidate2":
-                return candidate_embeddings[1]
+            elif text == ["candidate1", "candidate2"]:
+                return candidate_embeddings
 
         mock_model.encode.side_effect = mock_encode
 
@@ -150,6 +193,12 @@ class TestSemanticKNN(unittest.TestCase):
 
         results = knn.find_nearest("query", candidates, k=1)
 
+        # Check that candidates were encoded in a single batched call
+        self.assertEqual(mock_model.encode.call_count, 2)
+        mock_model.encode.assert_called_with(
+            ["candidate1", "candidate2"], convert_to_numpy=True
+        )
+
         # Check that cosine_similarity was called with correct parameters
         mock_cos_sim.assert_called_once()
 
@@ -160,6 +209,27 @@ class TestSemanticKNN(unittest.TestCase):
         )  # candidate1 has higher similarity
         self.assertEqual(results[0][1], 0.8)  # similarity score
 
+    def test_find_nearest_mixed_cache_hits(self, mock_cos_sim, mock_transformer):
+        """Test that cached and newly encoded candidates keep their order."""
+        mock_model = mock_transformer.return_value
+        mock_model.encode.return_value = np.array([[0.0, 1.0, 0.0]])
+        mock_cos_sim.return_value = np.array([[0.5, 0.9, 0.5]])
+
+        knn = self.SemanticKNN(cache_size=2)
+        knn.cache.add("query", np.array([1.0, 0.0, 0.0]))
+        knn.cache.add("cached", np.array([0.0, 0.0, 1.0]))
+
+        candidates = [{"input": "cached"}, {"input": "new"}, {"input": "cached"}]
+        results = knn.find_nearest("query", candidates, k=1)
+
+        # Only the uncached text is encoded, once
+        mock_model.encode.assert_called_once_with(["new"], convert_to_numpy=True)
+        np.testing.assert_allclose(
+            mock_cos_sim.call_args[0][1],
+            [[0.0, 0.0, 1.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+        )
+        self.assertEqual(results[0][0], candidates[1])
+
     def test_find_nearest_empty_candidates(self, mock_cos_sim, mock_transformer):
         """Test finding nearest neighbors with empty candidates list."""
         knn = self.SemanticKNN()
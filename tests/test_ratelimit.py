@@ -0,0 +1,69 @@
+"""
+Unit tests for client-side rate limiting.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from proctor.ratelimit import TokenBucket, RateLimiter, get_rate_limiter
+
+
+class TestRateLimit(unittest.TestCase):
+    """Test cases for the token bucket and rate limiter."""
+
+    @patch("proctor.ratelimit.time")
+    def test_token_bucket_waits_when_empty(self, mock_time):
+        """Test that the bucket only sleeps once its capacity is used up."""
+        mock_time.monotonic.return_value = 100.0
+        mock_sleep = mock_time.sleep
+        bucket = TokenBucket(rate_per_sec=2, capacity=2)
+
+        bucket.acquire()
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+
+        # Third token has to wait for half a second of refill
+        bucket.acquire()
+        mock_sleep.assert_called_once_with(0.5)
+
+        # Refill over time is capped at capacity
+        mock_time.monotonic.return_value = 200.0
+        bucket.acquire(2)
+        mock_sleep.assert_called_once()
+
+    @patch("proctor.ratelimit.asyncio.sleep", new_callable=AsyncMock)
+    @patch("proctor.ratelimit.time")
+    def test_rate_limiter_async(self, mock_time, mock_sleep):
+        """Test that the async limiter throttles requests and tokens."""
+        mock_time.monotonic.return_value = 100.0
+        limiter = RateLimiter(requests_per_minute=1, tokens_per_minute=600)
+
+        async def run():
+            await limiter.acquire_async(tokens=600)
+            await limiter.acquire_async(tokens=60)
+
+        asyncio.run(run())
+
+        # A minute for the second request, six seconds for its tokens
+        self.assertEqual(
+            [call.args[0] for call in mock_sleep.call_args_list], [60.0, 6.0]
+        )
+
+    def test_get_rate_limiter(self):
+        """Test that limiters are shared per endpoint and only made when configured."""
+        config = {"model": "test-model", "api_base": "https://api.test.com"}
+        self.assertIsNone(get_rate_limiter(config))
+
+        config["max_requests_per_minute"] = 100
+        limiter = get_rate_limiter(config)
+        self.assertIsNotNone(limiter.requests)
+        self.assertIsNone(limiter.tokens)
+        self.assertIs(get_rate_limiter(dict(config)), limiter)
+
+        config["model"] = "other-model"
+        self.assertIsNot(get_rate_limiter(config), limiter)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Unit tests for the semantic response cache.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+import numpy as np
+
+# Fixed embeddings so similarity is predictable without a real model
+_EMBEDDINGS = {
+    "What is the capital of France?": [1.0, 0.0, 0.0],
+    "What's France's capital city?": [0.99, 0.1, 0.0],
+    "How tall is Mount Everest?": [0.0, 1.0, 0.0],
+    "Who wrote Hamlet?": [0.0, 0.0, 1.0],
+}
+
+
+class FakeModel:
+    """Stand-in for SentenceTransformer with deterministic embeddings."""
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+        self.encoded = []
+
+    def encode(self, text, convert_to_numpy=True):
+        self.encoded.append(text)
+        return np.array(_EMBEDDINGS[text])
+
+
+@patch("proctor.semantic_cache._DEPS_AVAILABLE", True)
+@patch("proctor.embeddings.SentenceTransformer", FakeModel)
+class TestSemanticCache(unittest.TestCase):
+    """Test cases for SemanticCache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        from proctor import embeddings, semantic_cache
+
+        embeddings._MODELS.clear()
+        self.SemanticCache = semantic_cache.SemanticCache
+
+    def test_similar_prompt_hits(self):
+        """Test that a rephrased prompt is served from the cache."""
+        cache = self.SemanticCache(threshold=0.9)
+        cache.put("What is the capital of France?", "Paris")
+
+        self.assertEqual(cache.get("What's France's capital city?"), "Paris")
+        self.assertIsNone(cache.get("How tall is Mount Everest?"))
+        self.assertEqual(len(cache), 1)
+
+    def test_scope_by_system_prompt_and_model(self):
+        """Test that entries only match the same system prompt and model."""
+        cache = self.SemanticCache()
+        cache.put("What is the capital of France?", "Paris", "Be brief.", "model-a")
+
+        prompt = "What is the capital of France?"
+        self.assertEqual(cache.get(prompt, "Be brief.", "model-a"), "Paris")
+        self.assertIsNone(cache.get(prompt, "Be verbose.", "model-a"))
+        self.assertIsNone(cache.get(prompt, "Be brief.", "model-b"))
+
+    def test_persistence(self):
+        """Test that entries written to SQLite are loaded by a new cache."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "semcache.sqlite")
+            self.SemanticCache(path=path).put("What is the capital of France?", "Paris")
+
+            reloaded = self.SemanticCache(path=path)
+            self.assertEqual(reloaded.get("What's France's capital city?"), "Paris")
+
+            reloaded.clear()
+            self.assertEqual(len(self.SemanticCache(path=path)), 0)
+
+    def test_max_entries_evicts_oldest(self):
+        """Test that the oldest entry is evicted once the cache is full."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "semcache.sqlite")
+            cache = self.SemanticCache(path=path, max_entries=2)
+            cache.put("What is the capital of France?", "Paris")
+            cache.put("How tall is Mount Everest?", "8849 m")
+            cache.put("Who wrote Hamlet?", "Shakespeare")
+
+            self.assertEqual(len(cache), 2)
+            self.assertIsNone(cache.get("What is the capital of France?"))
+            self.assertEqual(cache.get("How tall is Mount Everest?"), "8849 m")
+            self.assertEqual(cache.get("Who wrote Hamlet?"), "Shakespeare")
+
+            # Evicted entries are removed from SQLite as well
+            reloaded = self.SemanticCache(path=path, max_entries=10)
+            self.assertEqual(len(reloaded), 2)
+            self.assertIsNone(reloaded.get("What is the capital of France?"))
+
+    def test_lookup_embedding_reused_by_put(self):
+        """Test that storing a miss reuses the embedding from the lookup."""
+        cache = self.SemanticCache()
+        response, embedding = cache.lookup("What is the capital of France?")
+        self.assertIsNone(response)
+
+        cache.put("What is the capital of France?", "Paris", embedding=embedding)
+        self.assertEqual(cache._model.encoded, ["What is the capital of France?"])
+        self.assertEqual(cache.get("What's France's capital city?"), "Paris")
+
+    @patch("proctor.utils.litellm.completion")
+    @patch("proctor.utils.get_llm_config")
+    def test_call_llm_uses_semantic_cache(self, mock_get_config, mock_completion):
+        """Test that call_llm consults and fills an installed semantic cache."""
+        from proctor.utils import call_llm, clear_llm_cache, set_semantic_cache
+
+        mock_get_config.return_value = {
+            "model": "test-model",
+            "api_base": "https://api.test.com",
+            "api_key": "test-key",
+            "temperature": 0,
+        }
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "Paris"
+        mock_completion.return_value = mock_response
+
+        cache = self.SemanticCache()
+        set_semantic_cache(cache)
+        clear_llm_cache()
+        try:
+            self.assertEqual(call_llm("What is the capital of France?"), "Paris")
+            # The miss is stored without embedding the prompt a second time
+            self.assertEqual(cache._model.encoded, ["What is the capital of France?"])
+            self.assertEqual(call_llm("What's France's capital city?"), "Paris")
+            mock_completion.assert_called_once()
+
+            # Opting out of caching also bypasses the semantic cache
+            call_llm("What's France's capital city?", config_override={"cache": False})
+            self.assertEqual(mock_completion.call_count, 2)
+        finally:
+            set_semantic_cache(None)
+            clear_llm_cache()
+
+
+if __name__ == "__main__":
+    unittest.main()
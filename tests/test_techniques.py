@@ -2,8 +2,9 @@
 Unit tests for prompt techniques.
 """
 
+import re
 import unittest
-import random
+from unittest.mock import patch
 
 from proctor import (
     get_technique,
@@ -20,12 +21,34 @@ from proctor import (
     DECOMP,
     SelfConsistency,
     StylePrompting,
+    FewShotCoT,
+    MemoryOfThought,
+    UncertaintyRouted,
 )
 
 
+def _head_sample(population, k):
+    """Deterministic stand-in for random.sample: the first k items."""
+    return population[:k]
+
+
 class TestTechniques(unittest.TestCase):
     """Test cases for prompt techniques."""
 
+    # Numbered reasoning steps start their own line, e.g. "2. [Apply ...]"
+    _STEP_RE = re.compile(r"^(\d+)\. ", re.MULTILINE)
+
+    @classmethod
+    def setUpClass(cls):
+        """Fetch the shared registry instances used by several tests."""
+        cls._role = get_technique("role_prompting")
+        cls._zcot = get_technique("zero_shot_cot")
+
+    def _assert_all_in(self, text, *needles):
+        """Assert that every needle occurs in text, reporting all missing ones."""
+        missing = [needle for needle in needles if needle not in text]
+        self.assertFalse(missing, f"Not found in prompt: {missing}")
+
     def test_get_technique(self):
         """Test retrieving techniques by name."""
         # Test getting a valid technique
@@ -63,7 +86,8 @@ class TestTechniques(unittest.TestCase):
 
     def test_zero_shot_cot(self):
         """Test ZeroShotCoT technique."""
-        technique = ZeroShotCoT()
+        technique = self._zcot
+        self.assertIsInstance(technique, ZeroShotCoT)
         self.assertEqual(technique.name, "Zero-Shot CoT")
         self.assertEqual(technique.identifier, "2.2.3.1")
 
@@ -92,18 +116,13 @@ class TestTechniques(unittest.TestCase):
         input_text = "What is the result of 25 × 4?"
         prompt = technique.generate_prompt(input_text)
 
-        self.assertIn(input_text, prompt)
-        self.assertIn("1. ", prompt)
-        self.assertIn("2. ", prompt)
-        self.assertIn("3. ", prompt)
-        self.assertIn("Therefore, the final answer is:", prompt)
+        self.assertEqual(self._STEP_RE.findall(prompt), ["1", "2", "3"])
+        self._assert_all_in(prompt, input_text, "Therefore, the final answer is:")
 
         # Test with different number of steps
         technique = ChainOfThought(num_steps=2)
         prompt = technique.generate_prompt(input_text)
-        self.assertIn("1. ", prompt)
-        self.assertIn("2. ", prompt)
-        self.assertNotIn("3. ", prompt)
+        self.assertEqual(self._STEP_RE.findall(prompt), ["1", "2"])
 
     def test_composite_technique(self):
         """Test composite technique."""
@@ -111,7 +130,7 @@ class TestTechniques(unittest.TestCase):
         composite = CompositeTechnique(
             name="Expert CoT",
             identifier="custom-composite",
-            techniques=[RolePrompting(), ZeroShotCoT()],
+            techniques=[self._role, self._zcot],
             description="Role-based reasoning",
         )
 
@@ -158,7 +177,8 @@ class TestTechniques(unittest.TestCase):
 
     def test_role_prompting(self):
         """Test RolePrompting technique."""
-        technique = RolePrompting()
+        technique = self._role
+        self.assertIsInstance(technique, RolePrompting)
         self.assertEqual(technique.name, "Role Prompting")
         self.assertEqual(technique.identifier, "2.2.2.2")
 
@@ -182,9 +202,31 @@ class TestTechniques(unittest.TestCase):
             audience="university students",
         )
 
-        self.assertIn("renowned physicist", prompt)
-        self.assertIn("quantum mechanics", prompt)
-        self.assertIn("Your target audience is university students", prompt)
+        self._assert_all_in(
+            prompt,
+            "renowned physicist",
+            "quantum mechanics",
+            "Your target audience is university students",
+        )
+
+        # Repeated options give the same prompt, on this or another instance
+        options = {"role": "physicist", "field": "quantum mechanics"}
+        prompt = technique.generate_prompt(input_text, **options)
+        self.assertEqual(technique.generate_prompts([input_text], **options)[0], prompt)
+        self.assertEqual(RolePrompting().generate_prompt(input_text, **options), prompt)
+
+        # Options that compare equal but differ in type render differently
+        self.assertNotEqual(
+            technique.generate_prompt(input_text, role="physicist", experience=3),
+            technique.generate_prompt(input_text, role="physicist", experience=3.0),
+        )
+
+        # A batch shares the options and matches one-by-one generation
+        inputs = [input_text, "Explain superposition."]
+        prompts = technique.generate_prompts(inputs, role="physicist")
+        self.assertEqual(
+            prompts, [technique.generate_prompt(x, role="physicist") for x in inputs]
+        )
 
     def test_style_prompting(self):
         """Test StylePrompting technique."""
@@ -212,10 +254,13 @@ class TestTechniques(unittest.TestCase):
             audience="undergraduates",
         )
 
-        self.assertIn("academic style", prompt)
-        self.assertIn("with a formal tone", prompt)
-        self.assertIn("in essay format", prompt)
-        self.assertIn("for undergraduates", prompt)
+        self._assert_all_in(
+            prompt,
+            "academic style",
+            "with a formal tone",
+            "in essay format",
+            "for undergraduates",
+        )
 
     def test_self_ask(self):
         """Test SelfAsk technique."""
@@ -227,9 +272,9 @@ class TestTechniques(unittest.TestCase):
         input_text = "What causes ocean tides?"
         prompt = technique.generate_prompt(input_text)
 
-        self.assertIn(input_text, prompt)
-        self.assertIn("Main Question:", prompt)
-        self.assertIn("self-questioning approach", prompt)
+        self._assert_all_in(
+            prompt, input_text, "Main Question:", "self-questioning approach"
+        )
 
         # Check default number of questions
         self.assertEqual(prompt.count("[Ask a specific"), 3)
@@ -256,9 +301,7 @@ class TestTechniques(unittest.TestCase):
         input_text = "Classify this sentiment."
         prompt = technique.generate_prompt(input_text)
 
-        self.assertIn(input_text, prompt)
-        self.assertIn("Example input 1", prompt)
-        self.assertIn("Example output 1", prompt)
+        self._assert_all_in(prompt, input_text, "Example input 1", "Example output 1")
         self.assertEqual(prompt.count("Input:"), 4)  # 3 examples + 1 actual input
 
         # Test with custom examples
@@ -268,10 +311,13 @@ class TestTechniques(unittest.TestCase):
         ]
 
         prompt = technique.generate_prompt(input_text, examples=custom_examples)
-        self.assertIn("The movie was terrible.", prompt)
-        self.assertIn("Negative", prompt)
-        self.assertIn("I loved the concert!", prompt)
-        self.assertIn("Positive", prompt)
+        self._assert_all_in(
+            prompt,
+            "The movie was terrible.",
+            "Negative",
+            "I loved the concert!",
+            "Positive",
+        )
         self.assertEqual(prompt.count("Input:"), 3)  # 2 examples + 1 actual input
 
     def test_knn(self):
@@ -295,21 +341,14 @@ class TestTechniques(unittest.TestCase):
         ]
 
         # Mock random.sample to return predictable results for testing
-        original_sample = random.sample
-        try:
-            random.sample = lambda population, k: population[:k]
-
+        with patch("random.sample", side_effect=_head_sample):
             prompt = technique.generate_prompt(
                 input_text, examples_pool=examples_pool, k=2
             )
-            self.assertIn("What is machine learning?", prompt)
-            self.assertIn("How do neural networks work?", prompt)
-            self.assertNotIn("Explain deep learning.", prompt)
-            self.assertEqual(prompt.count("Input:"), 3)  # 2 examples + 1 actual input
-
-        finally:
-            # Restore original random.sample
-            random.sample = original_sample
+        self.assertIn("What is machine learning?", prompt)
+        self.assertIn("How do neural networks work?", prompt)
+        self.assertNotIn("Explain deep learning.", prompt)
+        self.assertEqual(prompt.count("Input:"), 3)  # 2 examples + 1 actual input
 
     def test_chain_of_verification(self):
         """Test ChainOfVerification technique."""
@@ -321,11 +360,14 @@ class TestTechniques(unittest.TestCase):
         input_text = "What is the capital of France?"
         prompt = technique.generate_prompt(input_text)
 
-        self.assertIn(input_text, prompt)
-        self.assertIn("Problem Statement:", prompt)
-        self.assertIn("Verification Approach:", prompt)
-        self.assertIn("Initial Solution:", prompt)
-        self.assertIn("Verification of Step", prompt)
+        self._assert_all_in(
+            prompt,
+            input_text,
+            "Problem Statement:",
+            "Verification Approach:",
+            "Initial Solution:",
+            "Verification of Step",
+        )
 
         # Check default verification aspects
         self.assertIn("factual correctness", prompt)
@@ -342,10 +384,13 @@ class TestTechniques(unittest.TestCase):
         )
 
         self.assertEqual(prompt.count("Verification of Step"), 2)
-        self.assertIn("mathematical accuracy", prompt)
-        self.assertIn("conceptual clarity", prompt)
-        self.assertIn("construct counterexamples", prompt)
-        self.assertIn("exhaustive verification", prompt)
+        self._assert_all_in(
+            prompt,
+            "mathematical accuracy",
+            "conceptual clarity",
+            "construct counterexamples",
+            "exhaustive verification",
+        )
 
         # Test with domain
         prompt = technique.generate_prompt(input_text, domain="geography")
@@ -361,10 +406,13 @@ class TestTechniques(unittest.TestCase):
         input_text = "How do trees contribute to the ecosystem?"
         prompt = technique.generate_prompt(input_text)
 
-        self.assertIn(input_text, prompt)
-        self.assertIn("Complex Problem Analysis:", prompt)
-        self.assertIn("Decomposition Strategy:", prompt)
-        self.assertIn("Breaking Down the Problem:", prompt)
+        self._assert_all_in(
+            prompt,
+            input_text,
+            "Complex Problem Analysis:",
+            "Decomposition Strategy:",
+            "Breaking Down the Problem:",
+        )
 
         # Check default number of subproblems
         self.assertEqual(prompt.count("Subproblem"), 6)
@@ -379,9 +427,12 @@ class TestTechniques(unittest.TestCase):
         )
 
         self.assertEqual(prompt.count("Subproblem"), 4)
-        self.assertIn("in the ecology domain", prompt)
-        self.assertIn("Break the problem into major components", prompt)
-        self.assertIn("Explicitly note how each subproblem depends on", prompt)
+        self._assert_all_in(
+            prompt,
+            "in the ecology domain",
+            "Break the problem into major components",
+            "Explicitly note how each subproblem depends on",
+        )
 
     def test_self_consistency(self):
         """Test SelfConsistency technique."""
@@ -393,11 +444,14 @@ class TestTechniques(unittest.TestCase):
         input_text = "What is the best way to learn programming?"
         prompt = technique.generate_prompt(input_text)
 
-        self.assertIn(input_text, prompt)
-        self.assertIn("Multiple-Path Problem Solving", prompt)
-        self.assertIn("Independent Reasoning Paths:", prompt)
-        self.assertIn("Analysis of Results:", prompt)
-        self.assertIn("Consensus Determination:", prompt)
+        self._assert_all_in(
+            prompt,
+            input_text,
+            "Multiple-Path Problem Solving",
+            "Independent Reasoning Paths:",
+            "Analysis of Results:",
+            "Consensus Determination:",
+        )
 
         # Check default number of paths
         self.assertEqual(prompt.count("Path "), 5)
@@ -413,9 +467,12 @@ class TestTechniques(unittest.TestCase):
         )
 
         self.assertEqual(prompt.count("Path "), 4)
-        self.assertIn("in the computer science domain", prompt)
-        self.assertIn("Elaborate thoroughly on each reasoning path", prompt)
-        self.assertIn("briefly note your confidence level", prompt)
+        self._assert_all_in(
+            prompt,
+            "in the computer science domain",
+            "Elaborate thoroughly on each reasoning path",
+            "briefly note your confidence level",
+        )
 
         # Test with reasoning styles
         reasoning_styles = ["analytical", "empirical"]
@@ -426,6 +483,43 @@ class TestTechniques(unittest.TestCase):
         self.assertIn("Path 1 using analytical reasoning", prompt)
         self.assertIn("Path 2 using empirical reasoning", prompt)
 
+    def test_few_shot_cot_custom_examples(self):
+        """Test FewShotCoT with a reused and then modified examples list."""
+        technique = FewShotCoT()
+        examples = [
+            {"problem": "What is 2 + 2?", "reasoning": "Add 2 and 2.", "answer": "4"}
+        ]
+        input_text = "What is 3 + 3?"
+
+        prompt = technique.generate_prompt(input_text, examples=examples)
+        self.assertIn("Problem: What is 2 + 2?", prompt)
+        self.assertEqual(
+            technique.generate_prompt(input_text, examples=examples), prompt
+        )
+
+        # In-place edits to a reused list are picked up and revalidated
+        examples[0]["answer"] = "four"
+        prompt = technique.generate_prompt(input_text, examples=examples)
+        self.assertIn("Answer: four", prompt)
+
+        examples[0]["answer"] = ""
+        with self.assertRaises(ValueError):
+            technique.generate_prompt(input_text, examples=examples)
+
+    def test_memory_and_uncertainty_templates_end_with_reasoning_cue(self):
+        """Test that the problem follows the scaffold and precedes the cue."""
+        input_text = "What is 3 + 3?"
+
+        prompt = MemoryOfThought().generate_prompt(input_text, memory_capacity=3)
+        self.assertTrue(prompt.endswith(f"Problem: {input_text}\n\nReasoning:"))
+        self.assertLess(
+            prompt.index("Memory Capacity: Track last 3"), prompt.index("Step 1:")
+        )
+        self.assertLess(prompt.index("Final Answer:"), prompt.index(input_text))
+
+        prompt = UncertaintyRouted().generate_prompt(input_text)
+        self.assertTrue(prompt.endswith(f"Problem: {input_text}\n\nReasoning:"))
+
 
 if __name__ == "__main__":
     unittest.main()
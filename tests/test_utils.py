@@ -2,35 +2,42 @@
 Unit tests for utility functions.
 """
 
+import asyncio
 import unittest
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, AsyncMock
 
-from proctor.utils import dedent_prompt, call_llm, LLMError
+import httpx
+import litellm.exceptions
 
+from proctor.utils import (
+    call_llm,
+    call_llm_async,
+    call_llm_batch,
+    call_llm_marshalled,
+    call_llm_stream,
+    clear_llm_cache,
+    enable_http_connection_pool,
+    enable_redis_cache,
+    LLMError,
+)
 
-class TestUtils(unittest.TestCase):
-    """Test cases for utility functions."""
 
-    def test_dedent_prompt(self):
-        """Test dedent_prompt function."""
-        # Test with indented multi-line string
-        indented = """
-            This is a test prompt
-            with multiple lines
-                and varying indentation
-            levels.
-        """
+def _llm_response(content):
+    """Build a litellm-style completion response carrying ``content``."""
+    # Plain data: only choices[0].message.content exists, nothing is recorded
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
 
-        expected = "This is a test prompt\nwith multiple lines\n    and varying indentation\nlevels."
-        result = dedent_prompt(indented)
-        self.assertEqual(result, expected)
 
-        # Test with single line
-        single_line = "Single line prompt"
-        self.assertEqual(dedent_prompt(single_line), single_line)
+class TestUtils(unittest.TestCase):
+    """Test cases for utility functions."""
 
-        # Test with empty string
-        self.assertEqual(dedent_prompt(""), "")
+    @classmethod
+    def setUpClass(cls):
+        """Build the canned LLM responses shared by the call_llm tests."""
+        cls._ok_response = _llm_response("Test response")
+        cls._retry_response = _llm_response("Success after retry")
 
     @patch("proctor.utils.litellm.completion")
     @patch("proctor.utils.get_llm_config")
@@ -44,10 +51,7 @@ class TestUtils(unittest.TestCase):
         }
 
         # Mock successful response
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Test response"
-        mock_completion.return_value = mock_response
+        mock_completion.return_value = self._ok_response
 
         # Call function
         result = call_llm("Test prompt")
@@ -97,9 +101,6 @@ class TestUtils(unittest.TestCase):
     @patch("time.sleep")  # Mock sleep to avoid delays in tests
     def test_call_llm_retry_success(self, mock_sleep, mock_get_config, mock_completion):
         """Test LLM call with retry that eventually succeeds."""
-        # Import here to avoid circular imports
-        import litellm.exceptions
-
         # Mock configuration
         mock_get_config.return_value = {
             "model": "test-model",
@@ -114,15 +115,10 @@ class TestUtils(unittest.TestCase):
             model="test-model",
         )
 
-        # Set up successful response for second call
-        success_response = MagicMock()
-        success_response.choices = [MagicMock()]
-        success_response.choices[0].message.content = "Success after retry"
-
         # Set side effect for mock_completion
         mock_completion.side_effect = [
             rate_limit_error,  # First call fails with rate limit error
-            success_response,  # Second call succeeds
+            self._retry_response,  # Second call succeeds
         ]
 
         # Call function with max_retries=1
@@ -140,9 +136,6 @@ class TestUtils(unittest.TestCase):
         self, mock_sleep, mock_get_config, mock_completion
     ):
         """Test LLM call with retries that all fail."""
-        # Import here to avoid circular imports
-        import litellm.exceptions
-
         # Mock configuration
         mock_get_config.return_value = {
             "model": "test-model",
@@ -167,6 +160,334 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(mock_completion.call_count, 3)  # Initial call + 2 retries
         self.assertEqual(mock_sleep.call_count, 2)  # Should sleep twice between retries
 
+    @patch("proctor.utils.litellm.completion")
+    @patch("proctor.utils.get_llm_config")
+    @patch("time.sleep")
+    def test_call_llm_timeout_retried(self, mock_sleep, mock_get_config, mock_completion):
+        """Test that a timed-out call is retried."""
+        mock_get_config.return_value = {
+            "model": "test-model",
+            "api_base": "https://api.test.com",
+            "api_key": "test-key",
+        }
+        timeout_error = litellm.exceptions.Timeout(
+            message="Request timed out", model="test-model", llm_provider="test-provider"
+        )
+        mock_completion.side_effect = [timeout_error, self._retry_response]
+
+        self.assertEqual(call_llm("Test prompt", max_retries=1), "Success after retry")
+        self.assertEqual(mock_completion.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    @patch("proctor.utils.litellm.completion")
+    @patch("proctor.utils.get_llm_config")
+    @patch("time.sleep")
+    def test_call_llm_bad_request_not_retried(
+        self, mock_sleep, mock_get_config, mock_completion
+    ):
+        """Test that errors which cannot succeed on retry fail immediately."""
+        mock_get_config.return_value = {
+            "model": "test-model",
+            "api_base": "https://api.test.com",
+            "api_key": "test-key",
+        }
+        mock_completion.side_effect = litellm.exceptions.BadRequestError(
+            message="Invalid request", llm_provider="test-provider", model="test-model"
+        )
+
+        with self.assertRaises(LLMError) as context:
+            call_llm("Test prompt", max_retries=2)
+
+        self.assertIn("Invalid request", str(context.exception))
+        mock_completion.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch("proctor.utils.litellm.completion")
+    @patch("proctor.utils.get_llm_config")
+    @patch("time.sleep")
+    def test_call_llm_honors_retry_after(
+        self, mock_sleep, mock_get_config, mock_completion
+    ):
+        """Test that a Retry-After header overrides the backoff delay."""
+        mock_get_config.return_value = {
+            "model": "test-model",
+            "api_base": "https://api.test.com",
+            "api_key": "test-key",
+        }
+        rate_limit_error = litellm.exceptions.RateLimitError(
+            message="Rate limit exceeded",
+            llm_provider="test-provider",
+            model="test-model",
+            response=httpx.Response(
+                429,
+                headers={"retry-after": "7"},
+                request=httpx.Request("POST", "https://api.test.com"),
+            ),
+        )
+        mock_completion.side_effect = [rate_limit_error, self._retry_response]
+
+        self.assertEqual(call_llm("Test prompt", max_retries=1), "Success after retry")
+        mock_sleep.assert_called_once_with(7.0)
+
+    @patch("proctor.utils.litellm.completion")
+    @patch("proctor.utils.get_llm_config")
+    def test_call_llm_override_not_shared(self, mock_get_config, mock_completion):
+        """Test that config overrides do not leak into the base config."""
+        base_config = {
+            "model": "test-model",
+            "api_base": "https://api.test.com",
+            "api_key": "test-key",
+        }
+        mock_get_config.return_value = base_config
+
+        mock_completion.return_value = self._ok_response
+
+        call_llm("Test prompt", config_override={"model": "other-model"})
+        self.assertEqual(mock_completion.call_args.kwargs["model"], "other-model")
+        self.assertEqual(base_config["model"], "test-model")
+
+    @patch("proctor.utils.litellm.completion")
+    @patch("proctor.utils.get_llm_config")
+    def test_call_llm_response_cache(self, mock_get_config, mock_completion):
+        """Test that deterministic calls are served from the response cache."""
+        mock_get_config.return_value = {
+            "model": "test-model",
+            "api_base": "https://api.test.com",
+            "api_key": "test-key",
+            "temperature": 0,
+        }
+
+        mock_completion.return_value = self._ok_response
+
+        clear_llm_cache()
+        try:
+            self.assertEqual(call_llm("Cached prompt"), "Test response")
+            self.assertEqual(call_llm("Cached prompt"), "Test response")
+            mock_completion.assert_called_once()
+
+            # Non-deterministic calls always reach the provider
+            call_llm("Cached prompt", config_override={"temperature": 0.7})
+            self.assertEqual(mock_completion.call_count, 2)
+
+            # Moving text between the system and user prompt is a new request
+            call_llm("prompt", system_prompt="Cached ")
+            self.assertEqual(mock_completion.call_count, 3)
+        finally:
+            clear_llm_cache()
+
+    @patch("proctor.utils.litellm.acompletion", new_callable=AsyncMock)
+    @patch("proctor.utils.get_llm_config")
+    def test_call_llm_async_response_cache(self, mock_get_config, mock_acompletion):
+        """Test that async calls share the cache and honour the cache flag."""
+        mock_get_config.return_value = {
+            "model": "test-model",
+            "api_base": "https://api.test.com",
+            "api_key": "test-key",
+            "temperature": 0.7,
+        }
+
+        mock_acompletion.return_value = self._ok_response
+
+        clear_llm_cache()
+        try:
+            # Caching can be forced on for non-deterministic calls
+            override = {"cache": True}
+            for _ in range(2):
+                result = asyncio.run(
+                    call_llm_async("Cached prompt", config_override=override)
+                )
+                self.assertEqual(result, "Test response")
+            mock_acompletion.assert_called_once()
+
+            # ... and off for deterministic ones
+            override = {"cache": False, "temperature": 0}
+            asyncio.run(call_llm_async("Cached prompt", config_override=override))
+            asyncio.run(call_llm_async("Cached prompt", config_override=override))
+            self.assertEqual(mock_acompletion.call_count, 3)
+        finally:
+            clear_llm_cache()
+
+    @patch("proctor.utils.litellm.acompletion", new_callable=AsyncMock)
+    @patch("proctor.utils.get_llm_config")
+    def test_call_llm_batch(self, mock_get_config, mock_acompletion):
+        """Test that batched calls return responses in prompt order."""
+        mock_get_config.return_value = {
+            "model": "test-model",
+            "api_base": "https://api.test.com",
+            "api_key": "test-key",
+        }
+
+        def make_response(**kwargs):
+            return _llm_response(kwargs["messages"][-1]["content"])
+
+        mock_acompletion.side_effect = make_response
+
+        prompts = ["First", "Second", "Third"]
+        results = call_llm_batch(prompts, concurrency=2)
+
+        self.assertEqual(results, prompts)
+        self.assertEqual(mock_acompletion.call_count, 3)
+
+        with self.assertRaises(ValueError):
+            call_llm_batch(prompts, concurrency=0)
+
+        # With return_exceptions, one failed call does not abort the batch
+        mock_acompletion.side_effect = None
+        mock_acompletion.return_value = make_response(messages=[{"content": "OK"}])
+        results = call_llm_batch(["Valid", ""], return_exceptions=True)
+
+        self.assertEqual(results[0], "OK")
+        self.assertIsInstance(results[1], LLMError)
+
+    @patch("proctor.utils.call_llm")
+    @patch("proctor.utils.call_llm_batch")
+    def test_call_llm_marshalled(self, mock_call_llm_batch, mock_call_llm):
+        """Test that prompts are packed k per request and split back apart."""
+        mock_call_llm_batch.return_value = [
+            "1. Paris\n###\n2. Berlin",
+            "Rome",  # Wrong number of answers for its group
+            "Madrid",
+        ]
+        mock_call_llm.side_effect = lambda prompt, *args: prompt.upper()
+
+        prompts = ["France?", "Germany?", "Italy?", "Japan?", "Spain?"]
+        results = call_llm_marshalled(prompts, k=2)
+
+        self.assertEqual(results, ["Paris", "Berlin", "ITALY?", "JAPAN?", "Madrid"])
+        requests = mock_call_llm_batch.call_args.args[0]
+        self.assertEqual(len(requests), 3)
+        self.assertIn("1. France?\n2. Germany?", requests[0])
+        self.assertEqual(requests[2], "Spain?")
+        self.assertEqual(mock_call_llm.call_count, 2)
+
+        with self.assertRaises(ValueError):
+            call_llm_marshalled(prompts, k=0)
+
+    @patch("proctor.utils.litellm.completion")
+    @patch("proctor.utils.get_llm_config")
+    def test_call_llm_prompt_caching(self, mock_get_config, mock_completion):
+        """Test that prompt caching options are forwarded to litellm."""
+        mock_get_config.return_value = {
+            "model": "test-model",
+            "api_base": "https://api.test.com",
+            "api_key": "test-key",
+            "cache_system_prompt": True,
+            "prompt_cache_key": "proctor-test",
+        }
+
+        mock_completion.return_value = self._ok_response
+
+        call_llm("Test prompt", system_prompt="You are a helpful assistant.")
+
+        kwargs = mock_completion.call_args.kwargs
+        system_message, user_message = kwargs["messages"]
+
+        # The system prompt comes first and carries the cache marker
+        self.assertEqual(system_message["role"], "system")
+        self.assertEqual(
+            system_message["content"][0]["cache_control"], {"type": "ephemeral"}
+        )
+        self.assertEqual(user_message, {"role": "user", "content": "Test prompt"})
+        self.assertEqual(kwargs["prompt_cache_key"], "proctor-test")
+        self.assertNotIn("caching", kwargs)
+
+        # An installed litellm response cache is opted into per call
+        with patch("proctor.utils.litellm.cache", MagicMock()):
+            call_llm("Test prompt")
+        self.assertTrue(mock_completion.call_args.kwargs["caching"])
+
+        # Long system prompts to Anthropic models are marked automatically,
+        # with line endings normalized so the prefix is byte-stable
+        del mock_get_config.return_value["cache_system_prompt"]
+        long_prompt = "Follow these rules.\r\n" * 100 + "  \n"
+        call_llm(
+            "Test prompt",
+            system_prompt=long_prompt,
+            config_override={"model": "anthropic/claude-test"},
+        )
+        system_message = mock_completion.call_args.kwargs["messages"][0]
+        self.assertIn("cache_control", system_message["content"][0])
+        self.assertEqual(
+            system_message["content"][0]["text"],
+            ("Follow these rules.\n" * 100).rstrip(),
+        )
+
+        call_llm("Test prompt", system_prompt=long_prompt)
+        system_message = mock_completion.call_args.kwargs["messages"][0]
+        self.assertIsInstance(system_message["content"], str)
+
+    @patch("proctor.utils.litellm.completion")
+    @patch("proctor.utils.get_llm_config")
+    def test_call_llm_stream_early_stop(self, mock_get_config, mock_completion):
+        """Test that should_continue stops the stream and closes the response."""
+        mock_get_config.return_value = {
+            "model": "test-model",
+            "api_base": "https://api.test.com",
+            "api_key": "test-key",
+        }
+
+        chunks = []
+        for text in ["Step 1. ", "Dead end. ", "Step 2. "]:
+            chunk = MagicMock()
+            chunk.choices = [MagicMock()]
+            chunk.choices[0].delta.content = text
+            chunks.append(chunk)
+
+        mock_response = MagicMock()
+        mock_response.__iter__.return_value = iter(chunks)
+        mock_completion.return_value = mock_response
+
+        received = list(
+            call_llm_stream(
+                "Test prompt",
+                should_continue=lambda text: "Dead end" not in text,
+                chunk_coalesce_ms=0,
+            )
+        )
+
+        self.assertEqual(received, ["Step 1. ", "Dead end. "])
+        mock_completion.assert_called_once()
+        self.assertTrue(mock_completion.call_args.kwargs["stream"])
+        mock_response.close.assert_called_once()
+
+        # By default, deltas arriving close together are yielded as one piece
+        mock_response.__iter__.return_value = iter(chunks)
+        received = list(call_llm_stream("Test prompt"))
+        self.assertEqual(received, ["Step 1. Dead end. Step 2. "])
+
+    @patch("proctor.utils._http_pool_close_registered", False)
+    @patch("atexit.register")
+    def test_enable_http_connection_pool(self, mock_register):
+        """Test that a shared HTTP client is installed for litellm."""
+        with patch.object(litellm, "client_session", None):
+            enable_http_connection_pool(max_connections=10)
+            first = litellm.client_session
+            enable_http_connection_pool(max_connections=10)
+            client = litellm.client_session
+            try:
+                self.assertIsInstance(client, httpx.Client)
+                # The replaced client is closed, and one exit hook closes
+                # whichever client is current
+                self.assertTrue(first.is_closed)
+                mock_register.assert_called_once()
+                mock_register.call_args.args[0]()
+                self.assertTrue(client.is_closed)
+            finally:
+                client.close()
+
+    @patch("litellm.caching.Cache")
+    def test_enable_redis_cache(self, mock_cache):
+        """Test that a litellm Redis cache is installed from the environment."""
+        env = {"REDIS_HOST": "redis.test", "REDIS_PORT": "6380"}
+        with patch.object(litellm, "cache", None), patch.dict("os.environ", env):
+            enable_redis_cache(ttl=60)
+            self.assertIs(litellm.cache, mock_cache.return_value)
+
+        kwargs = mock_cache.call_args.kwargs
+        self.assertEqual(kwargs["type"], "redis")
+        self.assertEqual((kwargs["host"], kwargs["port"]), ("redis.test", "6380"))
+        self.assertEqual(kwargs["ttl"], 60)
+
 
 if __name__ == "__main__":
     unittest.main()